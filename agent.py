@@ -1,11 +1,17 @@
-import json
+import time
+import threading
+import litellm
+from rich.live import Live
 from rich.markdown import Markdown
-from rich.panel import Panel
+from rich.spinner import Spinner
 
 from functions.get_files_info import get_file_info
 from ai_utils import safe_completion
 from agent_tools import AGENT_TOOLS
-from agent_helpers import trim_memory, execute_tool
+from agent_helpers import (
+    trim_memory, execute_tool, execute_tools_parallel,
+    batch_tool_calls, parse_tool_args, PARALLEL_SAFE_TOOLS, MAX_PARALLEL_SUBAGENTS, FILE_TREE_HEADER, EXECUTOR,
+)
 from subagent import run_subagent
 from token_tracker import get_max_context_tokens
 
@@ -29,6 +35,7 @@ AGENT_SYSTEM_PROMPT = (
     "AVAILABLE TOOLS:\n"
     "- `get_files_info`: Map out the directory structure.\n"
     "- `get_file_content`: Read a file's contents. ALWAYS do this before modifying an existing file.\n"
+    "- `get_files_content`: Read several files at once. PREFER this over repeated `get_file_content` calls.\n"
     "- `write_file`: Create or overwrite a file. Provide the ENTIRE file content. Use ONLY for new files or full rewrites.\n"
     "- `edit_file`: Edit an existing file by search/replace. PREFERRED for modifications — provide the exact text block to find and its replacement.\n"
     "- `delete_file`: Delete a file.\n"
@@ -53,12 +60,77 @@ AGENT_SYSTEM_PROMPT = (
     "6. CONTEXT: The current project file tree is injected into your system prompt automatically.\n"
 )
 
+# Repaint rate of the streaming view; content is re-rendered no more often than this
+LIVE_REFRESH_PER_SECOND = 15
+
 
 def get_initial_messages():
     """Returns the initial message list for a fresh agent session."""
     return [{"role": "system", "content": AGENT_SYSTEM_PROMPT}]
 
 
+def get_latest_file_tree(messages):
+    """Returns the most recently injected file-tree message content, or None."""
+    for msg in reversed(messages):
+        content = msg.get("content")
+        if msg.get("role") == "system" and isinstance(content, str) and content.startswith(FILE_TREE_HEADER):
+            return content
+    return None
+
+
+def stream_completion(console, model, messages, tools):
+    """Streams a completion, rendering content live as it arrives.
+    
+    Shows a spinner until the first token, then the Markdown-rendered content so
+    far. The live view is transient: once the stream ends, the caller prints the
+    final styled output. Tool-call fragments are stitched together by index.
+    Returns (full_content, stitched_tools, chunks).
+    """
+    content_parts = []
+    stitched_tools = {}
+    chunks = []
+    last_render, rendered_parts = 0.0, 0
+
+    with Live(Spinner("dots", text="[bold cyan]Thinking...[/bold cyan]"), console=console,
+              refresh_per_second=LIVE_REFRESH_PER_SECOND, transient=True) as live:
+        response = safe_completion(model=model, messages=messages, tools=tools, stream=True)
+        for chunk in response:
+            chunks.append(chunk)
+            if not chunk.choices:
+                continue  # Trailing usage-only chunk
+            delta = chunk.choices[0].delta
+
+            if delta.content:
+                content_parts.append(delta.content)
+
+            for tool_chunk in delta.tool_calls or []:
+                idx = tool_chunk.index if tool_chunk.index is not None else len(stitched_tools)
+                if idx not in stitched_tools:
+                    stitched_tools[idx] = {"id": None, "name": "", "arguments": []}
+                if tool_chunk.id:
+                    stitched_tools[idx]["id"] = tool_chunk.id
+                if tool_chunk.function:
+                    if tool_chunk.function.name:
+                        stitched_tools[idx]["name"] = tool_chunk.function.name
+                    if tool_chunk.function.arguments:
+                        stitched_tools[idx]["arguments"].append(tool_chunk.function.arguments)
+
+            # Re-parsing the growing Markdown on every delta is quadratic; Live only
+            # repaints LIVE_REFRESH_PER_SECOND times a second, so render at that rate.
+            # Checked on every chunk so trailing text still shows while tool calls stream.
+            if len(content_parts) != rendered_parts:
+                now = time.monotonic()
+                if now - last_render >= 1 / LIVE_REFRESH_PER_SECOND:
+                    live.update(Markdown("".join(content_parts)))
+                    last_render, rendered_parts = now, len(content_parts)
+
+    # Argument fragments are collected as lists and joined once, not grown with +=
+    for tc in stitched_tools.values():
+        tc["arguments"] = "".join(tc["arguments"])
+
+    return "".join(content_parts), stitched_tools, chunks
+
+
 def run_agent_loop(model, console, working_dir, user_input, messages, tracker=None):
     """
     Single ReAct loop. The agent processes user input, calls tools as needed,
@@ -70,8 +142,12 @@ def run_agent_loop(model, console, working_dir, user_input, messages, tracker=No
 
     # Inject file tree once as a standalone message — never mutate messages[0].
     # The agent can call get_files_info as a tool if it needs a refresh later.
+    # An unchanged tree is not re-injected: the copy already in history still applies,
+    # and leaving history untouched keeps the provider-side prompt cache warm.
     file_tree = get_file_info(working_dir, ".")
-    messages.append({"role": "system", "content": f"CURRENT PROJECT FILES:\n{file_tree}"})
+    file_tree_content = FILE_TREE_HEADER + file_tree
+    if file_tree_content != get_latest_file_tree(messages):
+        messages.append({"role": "system", "content": file_tree_content})
 
     MAX_ITERATIONS = 200
     iteration = 0
@@ -82,26 +158,10 @@ def run_agent_loop(model, console, working_dir, user_input, messages, tracker=No
             max_tokens = get_max_context_tokens(model)
             messages = trim_memory(messages, max_tokens, console, model)
 
-            with console.status("[bold cyan]Thinking...[/bold cyan]", spinner="dots"):
-                response = safe_completion(
-                    model=model,
-                    messages=messages,
-                    tools=AGENT_TOOLS
-                )
-                
-                if tracker:
-                    tracker.record(response)
-                assistant_message = response.choices[0].message
-                full_content = assistant_message.content if assistant_message.content else ""
-                
-                stitched_tools = {}
-                if assistant_message.tool_calls:
-                    for idx, tool_call in enumerate(assistant_message.tool_calls):
-                        stitched_tools[idx] = {
-                            "id": tool_call.id,
-                            "name": tool_call.function.name,
-                            "arguments": tool_call.function.arguments
-                        }
+            full_content, stitched_tools, chunks = stream_completion(console, model, messages, AGENT_TOOLS)
+            if tracker:
+                # Rebuild a complete response from the chunks so usage and cost can be recorded
+                tracker.record(litellm.stream_chunk_builder(chunks, messages=messages))
 
             # Build the assistant message for chat history
             assistant_msg = {"role": "assistant", "content": full_content}
@@ -135,15 +195,49 @@ def run_agent_loop(model, console, working_dir, user_input, messages, tracker=No
 
             # If there are tool calls, execute them and loop
             if parsed_tool_calls:
-                for tc in parsed_tool_calls:
+                for batch in batch_tool_calls(parsed_tool_calls):
+                    # Consecutive read-only calls run concurrently; results keep call order
+                    if len(batch) > 1 and batch[0]["name"] in PARALLEL_SAFE_TOOLS:
+                        calls = [(tc["name"], parse_tool_args(tc["arguments"])) for tc in batch]
+                        results = execute_tools_parallel(calls, working_dir, console)
+                        messages.extend({
+                            "role": "tool",
+                            "name": tc["name"],
+                            "content": str(function_result),
+                            "tool_call_id": tc["id"]
+                        } for tc, function_result in zip(batch, results))
+                        continue
+
+                    # Several sub-agents in one turn fan out concurrently and are joined here
+                    if len(batch) > 1 and batch[0]["name"] == "spawn_subagent":
+                        task_descs = [parse_tool_args(tc["arguments"]).get("task_description", "") for tc in batch]
+                        console.print(f"\n[bold magenta] Spawning {len(batch)} sub-agents in parallel[/bold magenta]")
+                        # Run in waves so nested summarization inside sub-agents always finds free workers.
+                        # Only the main thread sees Ctrl+C, so it signals the pool threads to stop.
+                        cancel_event = threading.Event()
+                        subagent_results = []
+                        try:
+                            for i in range(0, len(task_descs), MAX_PARALLEL_SUBAGENTS):
+                                subagent_results.extend(EXECUTOR.map(
+                                    lambda task_desc: run_subagent(model, console, task_desc, working_dir,
+                                                                   tracker=tracker, cancel_event=cancel_event),
+                                    task_descs[i:i + MAX_PARALLEL_SUBAGENTS]
+                                ))
+                        except KeyboardInterrupt:
+                            cancel_event.set()
+                            raise
+                        messages.extend({
+                            "role": "tool",
+                            "name": "spawn_subagent",
+                            "content": f"SUB-AGENT RESULT:\n{subagent_result}",
+                            "tool_call_id": tc["id"]
+                        } for tc, subagent_result in zip(batch, subagent_results))
+                        continue
+
+                    tc = batch[0]
                     function_name = tc["name"]
-                    args_string = tc["arguments"]
                     tool_call_id = tc["id"]
-                    
-                    try:
-                        args = json.loads(args_string)
-                    except json.JSONDecodeError:
-                        args = {}
+                    args = parse_tool_args(tc["arguments"])
 
                     # Handle spawn_subagent specially
                     if function_name == "spawn_subagent":
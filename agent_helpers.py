@@ -1,12 +1,17 @@
 import os
-import difflib
+import json
+import hashlib
+import threading
+import contextlib
 import litellm
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, CancelledError
 from rich.markdown import Markdown
 from rich.panel import Panel
 
 
-from functions.get_files_info import get_file_info
-from functions.get_file_content import get_file_content
+from functions.get_files_info import get_file_info, invalidate_file_info_cache
+from functions.get_file_content import get_file_content, get_files_content
 from functions.write_file import write_file
 from functions.edit_file import edit_file
 from functions.delete_file import delete_file
@@ -20,30 +25,57 @@ from functions.project_state import get_progress, write_progress
 from ai_utils import safe_completion
 
 
-def summarize_history(model, messages_to_summarize):
-    """Compresses older conversation history into a dense LLM-generated summary."""
-    conversation_text = ""
-    for msg in messages_to_summarize:
-        raw_role = msg.get("role") if isinstance(msg, dict) else getattr(msg, "role", "")
-        raw_content = msg.get("content") if isinstance(msg, dict) else getattr(msg, "content", "")
-        raw_name = msg.get("name") if isinstance(msg, dict) else getattr(msg, "name", "")
-        
-        role = str(raw_role) if raw_role is not None else ""
-        content = str(raw_content) if raw_content is not None else ""
-        name = str(raw_name) if raw_name is not None else ""
-        
-        tool_calls = msg.get("tool_calls", []) if isinstance(msg, dict) else getattr(msg, "tool_calls", [])
-        if tool_calls:
-            for tc in tool_calls:
-                func = tc.get("function", {}) if isinstance(tc, dict) else getattr(tc, "function", None)
-                func_name = func.get("name", "") if isinstance(func, dict) else getattr(func, "name", "")
-                func_args = func.get("arguments", "") if isinstance(func, dict) else getattr(func, "arguments", "")
-                content = content + f"\n[ACTION TAKEN: Called tool '{func_name}' with instructions: {func_args}]"
-
-        prefix = f"{role} ({name})" if name else role
-        safe_content = str(content)[:2000] + ("..." if len(str(content)) > 2000 else "")
-        conversation_text += f"[{prefix.upper()}]: {safe_content}\n"
+# One pool shared by every parallel site (read-only tool batches, sub-agent fan-out,
+# chunked summarization) so no turn pays for spinning threads up and tearing them down.
+# Sub-agents block on nested submits (summarization chunks, read-only tool batches),
+# which never submit further work themselves, so callers must keep at most
+# MAX_PARALLEL_SUBAGENTS of them in flight to always leave workers free for the leaves.
+# The interpreter joins these workers at exit; fanned-out sub-agents are stopped
+# through their cancel_event rather than by shutting the pool down.
+EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="agent-tool")
+
+# Prefix of the standalone system message carrying the project file tree. Kept as one
+# constant so the injected message is byte-identical across turns and sessions.
+FILE_TREE_HEADER = "CURRENT PROJECT FILES:\n"
+
+# Every message in history is a plain dict: the loops in agent.py and subagent.py copy
+# SDK response objects into dicts before appending, so no attribute access is needed.
+
+# Summarization input is split into chunks of at most this many chars, so one
+# summarization call never grows with the length of the history
+SUMMARY_CHUNK_CHARS = 40_000
+
+# Carried-over summaries are re-summarized once their combined text exceeds this,
+# so repeated trims converge instead of stacking summaries indefinitely
+SUMMARY_MAX_CHARS = 20_000
+SUMMARY_PREFIX = "PREVIOUS CONVERSATION SUMMARY:\n"
+
 
+def format_message_for_summary(msg):
+    """Renders one message as a single transcript line for the summarizer."""
+    raw_role = msg.get("role")
+    raw_content = msg.get("content")
+    raw_name = msg.get("name")
+    
+    role = str(raw_role) if raw_role is not None else ""
+    content = str(raw_content) if raw_content is not None else ""
+    name = str(raw_name) if raw_name is not None else ""
+    
+    tool_calls = msg.get("tool_calls", [])
+    if tool_calls:
+        for tc in tool_calls:
+            func = tc.get("function", {})
+            func_name = func.get("name", "")
+            func_args = func.get("arguments", "")
+            content = content + f"\n[ACTION TAKEN: Called tool '{func_name}' with instructions: {func_args}]"
+
+    prefix = f"{role} ({name})" if name else role
+    safe_content = content[:2000] + ("..." if len(content) > 2000 else "")
+    return f"[{prefix.upper()}]: {safe_content}\n"
+
+
+def summarize_transcript(model, conversation_text):
+    """Runs a single summarization LLM call over a transcript."""
     prompt = (
         "You are the agent's memory module. Summarize the following conversation history. "
         "Focus strictly on: 1) What tasks have been completed. 2) What decisions were made. "
@@ -59,28 +91,65 @@ def summarize_history(model, messages_to_summarize):
     return response.choices[0].message.content
 
 
+def summarize_lines(model, lines, mapper=None):
+    """Map-reduce summarization over transcript lines.
+    
+    Lines are packed into chunks of at most SUMMARY_CHUNK_CHARS. A single chunk
+    is summarized directly; otherwise each chunk is summarized concurrently and
+    the partial summaries are reduced the same way until one chunk remains.
+    `mapper(fn, chunks)` replaces the shared pool's map, e.g. to run serially.
+    """
+    chunks = []
+    current, current_len = [], 0
+    for line in lines:
+        if current and current_len + len(line) > SUMMARY_CHUNK_CHARS:
+            chunks.append("".join(current))
+            current, current_len = [], 0
+        current.append(line)
+        current_len += len(line)
+    if current:
+        chunks.append("".join(current))
+
+    if len(chunks) <= 1:
+        return summarize_transcript(model, chunks[0] if chunks else "")
+
+    partial_summaries = list((mapper or EXECUTOR.map)(lambda chunk: summarize_transcript(model, chunk), chunks))
+
+    # Cap each partial so several fit per chunk and every pass strictly shrinks the input
+    partial_cap = SUMMARY_CHUNK_CHARS // 4
+    partial_lines = [
+        f"[SUMMARY OF PART {i}]: {str(summary or '')[:partial_cap]}\n"
+        for i, summary in enumerate(partial_summaries, 1)
+    ]
+    return summarize_lines(model, partial_lines, mapper)
+
+
+def summarize_history(model, messages_to_summarize, mapper=None):
+    """Compresses older conversation history into a dense LLM-generated summary."""
+    return summarize_lines(model, [format_message_for_summary(msg) for msg in messages_to_summarize], mapper)
+
+
 # Tool results larger than this (in chars) will be shrunk once they leave the recent window
 SHRINK_THRESHOLD = 500
 PROTECT_RECENT = 8
 
 
-def shrink_old_tool_results(messages, protect_recent=PROTECT_RECENT):
+def shrink_old_tool_results(messages, protect_recent=PROTECT_RECENT, start=1):
     """Replace large, already-processed tool results with compact summaries.
     
     Keeps recent messages intact (they may still be needed for the current
     reasoning chain) but shrinks older tool outputs that the agent has 
     already acted upon — preventing stale file reads and command outputs
-    from wasting context for the rest of the session.
+    from wasting context for the rest of the session. Messages before `start`
+    are assumed to have been handled by an earlier pass.
     """
     if len(messages) <= protect_recent + 1:  # +1 for system prompt
         return messages
     
     cutoff = len(messages) - protect_recent
     
-    for i in range(1, cutoff):  # Skip system prompt at index 0
+    for i in range(max(start, 1), cutoff):  # Skip system prompt at index 0
         msg = messages[i]
-        if not isinstance(msg, dict):
-            continue
         if msg.get("role") != "tool":
             continue
             
@@ -104,74 +173,420 @@ def shrink_old_tool_results(messages, protect_recent=PROTECT_RECENT):
     return messages
 
 
+# Cached token counts, keyed by (model, digest of the counted text) in least recently
+# used order. Only the digest is kept, never the message, so histories dropped by a
+# trim are not pinned in memory; a message whose content was replaced (e.g. shrunk)
+# hashes differently and is recounted.
+TOKEN_CACHE_SIZE = 4096
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def count_message_tokens(msg, model):
+    """Count tokens for a single message, tokenizing each distinct text only once."""
+    content = msg.get("content", "")
+    tool_calls = msg.get("tool_calls", [])
+    text = str(content or "")
+    if tool_calls:
+        # Count the name and raw JSON arguments the model actually sees, rather than
+        # re-formatting the whole list of dicts through str()
+        for tc in tool_calls:
+            func = tc.get("function", {})
+            func_name = func.get("name", "")
+            func_args = func.get("arguments", "")
+            text += f" {func_name} {func_args or ''}"
+
+    key = (model, hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest())
+    with _token_cache_lock:
+        count = _token_cache.get(key)
+        if count is not None:
+            _token_cache.move_to_end(key)
+            return count
+
+    try:
+        count = litellm.token_counter(model=model, text=text)
+    except Exception:
+        count = len(text) // 4  # Fallback: ~4 chars per token
+
+    with _token_cache_lock:
+        _token_cache[key] = count
+        if len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)  # Evict the least recently used entry
+    return count
+
+
+# Running token totals per history list: id(messages) -> [messages, counted_len, shrunk_upto, total].
+# Between trims a history only grows by appends (plus in-place shrinking, which
+# trim_memory accounts for), so each call only has to look at the new tail.
+HISTORY_TOTALS_SIZE = 64
+_history_totals = {}
+
+# Once a main-thread history passes this fraction of its budget, its older messages
+# are summarized in the background, so the trim at the hard limit usually finds the
+# summary ready instead of blocking the next turn on a fresh summarization call.
+SPECULATIVE_SUMMARY_RATIO = 0.8
+
+# In-flight background summaries: id(messages) -> (messages, summarized messages, future, abandoned).
+# Setting the `abandoned` event stops a background summary before its next LLM call.
+_pending_summaries = {}
+
+
+def _drop_pending_summary(messages):
+    """Removes and abandons the background summary of `messages`. Caller holds _token_cache_lock."""
+    pending = _pending_summaries.pop(id(messages), None)
+    if pending is not None:
+        pending[3].set()
+    return pending
+
+
+def release_history(messages):
+    """Forgets the running totals and abandons any background summary kept for a finished history."""
+    with _token_cache_lock:
+        _history_totals.pop(id(messages), None)
+        _drop_pending_summary(messages)
+
+
+def split_history(messages):
+    """Splits a history for trimming into (middle, tail) around the system prompt.
+    
+    The tail is the recent messages kept verbatim; the middle is everything
+    between the system prompt and the tail, to be replaced by a summary.
+    """
+    tail = messages[-8:]
+    
+    # Drop orphaned 'tool' messages at the start of the tail
+    while len(tail) > 0:
+        first_msg = tail[0]
+        role = first_msg.get("role")
+        if role == "tool":
+            tail.pop(0)
+        else:
+            break
+            
+    return messages[1 : len(messages) - len(tail)], tail
+
+
+def split_summaries(middle_messages):
+    """Separates carried-over summaries (returned as text) from regular messages."""
+    old_summaries = []
+    regular_messages = []
+    for msg in middle_messages:
+        content = msg.get("content", "")
+        if str(content).startswith(SUMMARY_PREFIX):
+            old_summaries.append(str(content)[len(SUMMARY_PREFIX):])
+        else:
+            regular_messages.append(msg)
+    return old_summaries, regular_messages
+
+
+def _run_background_summary(future, model, regular_messages, abandoned):
+    """Body of a background summary thread: summarizes serially, stopping once abandoned."""
+    if not future.set_running_or_notify_cancel():
+        return
+
+    def serial_map(fn, items):
+        # Serial and off the shared pool, so nothing the interpreter joins at exit waits on it
+        for item in items:
+            if abandoned.is_set():
+                raise CancelledError()
+            yield fn(item)
+
+    try:
+        if abandoned.is_set():
+            raise CancelledError()
+        future.set_result(summarize_history(model, regular_messages, serial_map))
+    except BaseException as e:
+        future.set_exception(e)
+
+
+def start_background_summary(messages, model):
+    """Starts summarizing the current middle of `messages` on a daemon thread, once per history.
+    
+    A daemon thread (not the shared pool) so a pending speculative summary never holds
+    the process open on exit. Only the main thread speculates: sub-agent histories are
+    short-lived, so their background summaries would mostly be wasted calls.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    with _token_cache_lock:
+        pending = _pending_summaries.get(id(messages))
+        if pending is not None and pending[0] is messages:
+            return
+
+    _, regular_messages = split_summaries(split_history(messages)[0])
+    if not regular_messages:
+        return
+    future, abandoned = Future(), threading.Event()
+    threading.Thread(
+        target=_run_background_summary, args=(future, model, regular_messages, abandoned),
+        name="agent-summary", daemon=True,
+    ).start()
+
+    with _token_cache_lock:
+        if len(_pending_summaries) >= HISTORY_TOTALS_SIZE:
+            _drop_pending_summary(_pending_summaries[next(iter(_pending_summaries))][0])  # Evict the oldest entry
+        _pending_summaries[id(messages)] = (messages, regular_messages, future, abandoned)
+
+
+def summarize_regular_messages(model, messages, regular_messages):
+    """Summarizes regular_messages, reusing a finished background summary of their prefix."""
+    with _token_cache_lock:
+        pending = _pending_summaries.pop(id(messages), None)  # Claimed here, so not abandoned
+
+    parts = []
+    remaining = regular_messages
+    if pending is not None and pending[0] is messages:
+        done = pending[1]
+        # Appends only ever extend the middle, so the speculated messages must be its prefix
+        if len(done) <= len(regular_messages) and all(a is b for a, b in zip(done, regular_messages)):
+            try:
+                parts.append(pending[2].result())
+                remaining = regular_messages[len(done):]
+            except Exception:
+                pass  # Background call failed; summarize everything now instead
+        else:
+            pending[3].set()  # Speculated on a different history; stop it
+
+    if remaining:
+        parts.append(summarize_history(model, remaining))
+    return "\n\n".join(part for part in parts if part)
+
+
 def trim_memory(messages, max_tokens, console, model):
     """Trims the agent's memory to stay within context window limits using token counting."""
-    # Proactively shrink old tool results before counting tokens
-    messages = shrink_old_tool_results(messages)
-
-    def count_message_tokens(msg):
-        """Count tokens for a single message using the model's tokenizer."""
-        content = msg.get("content", "") if isinstance(msg, dict) else getattr(msg, "content", "")
-        tool_calls = msg.get("tool_calls", []) if isinstance(msg, dict) else getattr(msg, "tool_calls", [])
-        text = str(content or "")
-        if tool_calls:
-            text += " " + str(tool_calls)
-        try:
-            return litellm.token_counter(model=model, text=text)
-        except Exception:
-            return len(text) // 4  # Fallback: ~4 chars per token
-
-    total_tokens = sum(count_message_tokens(m) for m in messages)
-
-    if total_tokens > max_tokens:
-        console.print(f"\n[dim]Memory reached {total_tokens:,} tokens (limit: {max_tokens:,}). Summarizing older messages...[/dim]")
-        
-        system_prompt = messages[0]
-        tail = messages[-8:]
-        
-        # Drop orphaned 'tool' messages at the start of the tail
-        while len(tail) > 0:
-            first_msg = tail[0]
-            role = first_msg.get("role") if isinstance(first_msg, dict) else getattr(first_msg, "role", "")
-            if role == "tool":
-                tail.pop(0)
+    with _token_cache_lock:
+        state = _history_totals.get(id(messages))
+    if state is None or state[0] is not messages or state[1] > len(messages):
+        state = [messages, 0, 1, 0]
+    _, counted, shrunk_upto, total_tokens = state
+
+    # Proactively shrink old tool results before counting tokens. Only messages that
+    # left the recent window since the last call are new candidates; any of them that
+    # were already counted are re-counted after shrinking.
+    cutoff = len(messages) - PROTECT_RECENT
+    if cutoff > shrunk_upto:
+        recount = messages[shrunk_upto:min(cutoff, counted)]
+        total_tokens -= sum(count_message_tokens(m, model) for m in recount)
+        messages = shrink_old_tool_results(messages, start=shrunk_upto)
+        total_tokens += sum(count_message_tokens(m, model) for m in recount)
+        shrunk_upto = cutoff
+
+    total_tokens += sum(count_message_tokens(m, model) for m in messages[counted:])
+
+    # Fast path: under budget, nothing else to do
+    if total_tokens <= max_tokens:
+        with _token_cache_lock:
+            _history_totals.pop(id(messages), None)
+            if len(_history_totals) >= HISTORY_TOTALS_SIZE:
+                del _history_totals[next(iter(_history_totals))]  # Evict the oldest entry
+            _history_totals[id(messages)] = [messages, len(messages), shrunk_upto, total_tokens]
+        if total_tokens > max_tokens * SPECULATIVE_SUMMARY_RATIO:
+            start_background_summary(messages, model)
+        return messages
+
+    with _token_cache_lock:
+        _history_totals.pop(id(messages), None)
+
+    console.print(f"\n[dim]Memory reached {total_tokens:,} tokens (limit: {max_tokens:,}). Summarizing older messages...[/dim]")
+    
+    system_prompt = messages[0]
+    middle_messages, tail = split_history(messages)
+    
+    # Preserve existing summaries verbatim instead of re-summarizing them
+    old_summaries, regular_messages = split_summaries(middle_messages)
+    
+    new_summary = summarize_regular_messages(model, messages, regular_messages) if regular_messages else ""
+    
+    # Combine: old summaries preserved as-is, new summary appended
+    combined_parts = old_summaries + ([new_summary] if new_summary else [])
+    combined_text = "\n\n".join(combined_parts)
+    if len(combined_text) > SUMMARY_MAX_CHARS:
+        combined_text = summarize_lines(model, [part + "\n\n" for part in combined_parts])
+    
+    summary_message = {
+        "role": "system", 
+        "content": f"{SUMMARY_PREFIX}{combined_text}"
+    }
+    
+    messages = [system_prompt, summary_message] + tail
+    console.print(f"[dim]Memory optimized. Resuming with {sum(count_message_tokens(m, model) for m in messages):,} tokens.[/dim]")
+
+    return messages
+
+
+# Above this edit distance Myers' O(D^2) trace gets large; fall back to difflib
+MYERS_MAX_EDITS = 1000
+
+
+def _myers_opcodes(a, b):
+    """Returns SequenceMatcher-style opcodes for two sequences of ints using Myers' diff.
+    
+    Runs in O((N+M)·D) where D is the edit distance — fast for the common case of
+    a small edit to a large file. Returns None if D exceeds MYERS_MAX_EDITS.
+    """
+    n, m = len(a), len(b)
+    v = {1: 0}
+    trace = []
+    for d in range(min(n + m, MYERS_MAX_EDITS) + 1):
+        trace.append(v.copy())
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
             else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
                 break
-                
-        middle_messages = messages[1 : len(messages) - len(tail)]
-        
-        # Preserve existing summaries verbatim instead of re-summarizing them
-        old_summaries = []
-        regular_messages = []
-        for msg in middle_messages:
-            content = msg.get("content", "") if isinstance(msg, dict) else getattr(msg, "content", "")
-            if str(content).startswith("PREVIOUS CONVERSATION SUMMARY:"):
-                old_summaries.append(str(content))
+        else:
+            continue
+        break
+    else:
+        return None
+
+    # Backtrack through the trace, collecting single-line edits from the end
+    edits = []
+    x, y = n, m
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v[k - 1] < v[k + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            edits.append(("equal", x, y))
+        if d > 0:
+            if x == prev_x:
+                edits.append(("insert", x, prev_y))
             else:
-                regular_messages.append(msg)
-        
-        new_summary = summarize_history(model, regular_messages) if regular_messages else ""
-        
-        # Combine: old summaries preserved as-is, new summary appended
-        combined_parts = old_summaries + ([new_summary] if new_summary else [])
-        combined_text = "\n\n".join(combined_parts)
-        
-        summary_message = {
-            "role": "system", 
-            "content": f"PREVIOUS CONVERSATION SUMMARY:\n{combined_text}"
-        }
-        
-        messages = [system_prompt, summary_message] + tail
-        console.print(f"[dim]Memory optimized. Resuming with {sum(count_message_tokens(m) for m in messages):,} tokens.[/dim]")
-
-    return messages
+                edits.append(("delete", prev_x, y))
+        x, y = prev_x, prev_y
+    edits.reverse()
+
+    # Collapse into opcodes; adjacent deletes and inserts become one 'replace'
+    opcodes = []
+    for tag, i, j in edits:
+        di, dj = (1, 1) if tag == "equal" else (1, 0) if tag == "delete" else (0, 1)
+        if opcodes and (opcodes[-1][0] == "equal") == (tag == "equal"):
+            prev_tag, i1, i2, j1, j2 = opcodes[-1]
+            if prev_tag != tag:
+                tag = "replace"
+            opcodes[-1] = (tag, i1, i2 + di, j1, j2 + dj)
+        else:
+            opcodes.append((tag, i, i + di, j, j + dj))
+    return opcodes
+
+
+def diff_opcodes(old_lines, new_lines):
+    """Returns SequenceMatcher-style opcodes describing how to turn old_lines into new_lines."""
+    # Common prefix/suffix are trimmed up front; only the changed middle is diffed
+    prefix = 0
+    limit = min(len(old_lines), len(new_lines))
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+    old_mid = old_lines[prefix:len(old_lines) - suffix]
+    new_mid = new_lines[prefix:len(new_lines) - suffix]
+
+    # Intern lines to small ints so the inner loop compares ints, not strings
+    line_ids = {}
+    old_ids = [line_ids.setdefault(line, len(line_ids)) for line in old_mid]
+    new_ids = [line_ids.setdefault(line, len(line_ids)) for line in new_mid]
+
+    if not old_ids or not new_ids:
+        middle = []
+        if old_ids or new_ids:
+            middle = [("delete" if old_ids else "insert", 0, len(old_ids), 0, len(new_ids))]
+    else:
+        middle = _myers_opcodes(old_ids, new_ids)
+        if middle is None:
+            import difflib  # Only needed for pathological rewrites; kept off the startup path
+            middle = difflib.SequenceMatcher(None, old_ids, new_ids).get_opcodes()
+
+    opcodes = []
+    if prefix:
+        opcodes.append(("equal", 0, prefix, 0, prefix))
+    for tag, i1, i2, j1, j2 in middle:
+        opcodes.append((tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix))
+    if suffix:
+        opcodes.append(("equal", len(old_lines) - suffix, len(old_lines), len(new_lines) - suffix, len(new_lines)))
+    return opcodes
+
+
+def _group_opcodes(opcodes, context=3):
+    """Splits opcodes into hunks with `context` lines around each change (as difflib does)."""
+    codes = list(opcodes)
+    if codes and codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    if codes and codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        # End the current hunk on a large unchanged range, keeping context on both sides
+        if tag == "equal" and i2 - i1 > context * 2:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _format_hunk_range(start, stop):
+    """Formats a hunk range for the @@ header in unified diff notation."""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def unified_diff(old_lines, new_lines, fromfile, tofile):
+    """Yields unified-diff lines, like difflib.unified_diff but backed by diff_opcodes."""
+    started = False
+    for group in _group_opcodes(diff_opcodes(old_lines, new_lines)):
+        if not started:
+            started = True
+            yield f"--- {fromfile}\n"
+            yield f"+++ {tofile}\n"
+        first, last = group[0], group[-1]
+        yield f"@@ -{_format_hunk_range(first[1], last[2])} +{_format_hunk_range(first[3], last[4])} @@\n"
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for line in old_lines[i1:i2]:
+                    yield " " + line
+                continue
+            for line in old_lines[i1:i2]:
+                yield "-" + line
+            for line in new_lines[j1:j2]:
+                yield "+" + line
 
 
 def show_diff(console, old_text, new_text, file_path):
     """Prints a colored unified diff to the console."""
+    if old_text == new_text:
+        console.print("[dim]No changes detected.[/dim]")
+        return
+
     old_lines = old_text.splitlines(keepends=True)
     new_lines = new_text.splitlines(keepends=True)
-    diff = difflib.unified_diff(old_lines, new_lines, fromfile=f"a/{file_path}", tofile=f"b/{file_path}")
+    diff = unified_diff(old_lines, new_lines, fromfile=f"a/{file_path}", tofile=f"b/{file_path}")
 
     has_diff = False
     for line in diff:
@@ -190,16 +605,33 @@ def show_diff(console, old_text, new_text, file_path):
         console.print("[dim]No changes detected.[/dim]")
 
 
+# Serializes interactive prompts when several sub-agents run concurrently. Reentrant so
+# a diff preview can hold it across the ask_approval call that also takes it.
+console_lock = threading.RLock()
+
+
+def status(console, message):
+    """Returns a spinner context for the main thread, or a no-op inside worker threads.
+    
+    Rich only allows one live display at a time, so concurrently running
+    sub-agents fall back to plain console output.
+    """
+    if threading.current_thread() is threading.main_thread():
+        return console.status(message, spinner="dots")
+    return contextlib.nullcontext()
+
+
 def ask_approval(console, message, approve_all):
     """Prompts for approval. Returns True if approved. Handles 'a' to enable approve-all."""
     if approve_all[0]:
         console.print(f"[dim]Auto-approved: {message}[/dim]")
         return True
     
-    console.print(f"\n[bold]Authorization Required: {message}[/bold]")
-    approval = ''
-    while approval not in ['y', 'yes', 'n', 'no', 'a']:
-        approval = console.input("[bold](y)es / (n)o / (a)pprove all > [/bold]").strip().lower()
+    with console_lock:
+        console.print(f"\n[bold]Authorization Required: {message}[/bold]")
+        approval = ''
+        while approval not in ['y', 'yes', 'n', 'no', 'a']:
+            approval = console.input("[bold](y)es / (n)o / (a)pprove all > [/bold]").strip().lower()
     
     if approval == 'a':
         approve_all[0] = True
@@ -209,39 +641,146 @@ def ask_approval(console, message, approve_all):
     return approval in ['y', 'yes']
 
 
-def execute_tool(function_name, args, working_dir, approve_all, console):
-    """Executes a single tool and returns the result string."""
-    function_result = ""
-
-    if function_name in ["get_files_info", "get_file_content", "create_directory", "web_search", "run_compiler"]:
-        with console.status(f"[bold]Executing {function_name}...[/bold]", spinner="dots"):
-            if function_name == "get_files_info":
-                function_result = get_file_info(working_dir, args.get("directory", "."))
-                console.print(f"[dim]Checked directory tree[/dim]")
-                
-            elif function_name == "get_file_content":
-                function_result = get_file_content(working_dir, args.get("file_path"))
-                console.print(f"[dim]Read file: {args.get('file_path')}[/dim]")
-                
-            elif function_name == "create_directory":
-                function_result = create_directory(working_dir, args.get("directory_path"))
-                console.print(f"[dim]Created directory: {args.get('directory_path')}[/dim]")
-                
-            elif function_name == "web_search":
-                function_result = web_search(args.get("query"))
-                console.print(f"[dim]Searched web for: {args.get('query')}[/dim]")
-                
-            elif function_name == "run_compiler":
-                function_result = run_compiler(working_dir, args.get("file_path"))
-                if "FATAL SYNTAX ERROR" in function_result or "Error" in function_result:
-                    console.print(Panel(function_result, title=f"Compile Failed: {args.get('file_path')}"))
-                else:
-                    console.print(f"[bold]Success:[/bold] {function_result}")
-
-    elif function_name == "write_file":
-        file_path = args.get("file_path")
-        content = args.get("content")
-        
+# Read-only tools with no approval prompt — safe to run concurrently in worker threads
+PARALLEL_SAFE_TOOLS = {"get_files_info", "get_file_content", "get_files_content", "web_search", "run_compiler"}
+
+# Per-workspace directory for on-disk tool caches (kept out of the file tree by get_files_info)
+AGENT_CACHE_DIR = ".agent_cache"
+
+# Sub-agents run in isolated contexts, so several spawned in one turn can run concurrently
+MAX_PARALLEL_SUBAGENTS = 8
+
+
+def parse_tool_args(args_string):
+    """Parses a tool call's JSON arguments, returning {} if they are malformed."""
+    try:
+        return json.loads(args_string)
+    except json.JSONDecodeError:
+        return {}
+
+
+def tool_args_key(args):
+    """Returns a canonical serialization of parsed tool arguments, for comparing calls."""
+    return json.dumps(args, sort_keys=True)
+
+
+def _batch_group(function_name):
+    """Returns the concurrency group a tool belongs to, or None if it must run alone."""
+    if function_name in PARALLEL_SAFE_TOOLS:
+        return "read_only"
+    if function_name == "spawn_subagent":
+        return "subagent"
+    return None
+
+
+def batch_tool_calls(tool_calls):
+    """Groups consecutive tool calls that can run together.
+    
+    Returns a list of batches in original order. A batch is either a run of
+    consecutive PARALLEL_SAFE_TOOLS calls, a run of consecutive spawn_subagent
+    calls, or a single call of any other tool — so side-effecting tools still
+    execute strictly in the order they were issued.
+    """
+    batches = []
+    for tc in tool_calls:
+        group = _batch_group(tc["name"])
+        if group and batches and _batch_group(batches[-1][0]["name"]) == group:
+            batches[-1].append(tc)
+        else:
+            batches.append([tc])
+    return batches
+
+
+# Read-only tools: name -> runner(args, working_dir)
+READ_ONLY_TOOL_RUNNERS = {
+    "get_files_info": lambda args, working_dir: get_file_info(working_dir, args.get("directory", ".")),
+    "get_file_content": lambda args, working_dir: get_file_content(working_dir, args.get("file_path")),
+    "get_files_content": lambda args, working_dir: get_files_content(working_dir, args.get("file_paths", [])),
+    "web_search": lambda args, working_dir: web_search(args.get("query"), cache_dir=os.path.join(working_dir, AGENT_CACHE_DIR)),
+    "run_compiler": lambda args, working_dir: run_compiler(working_dir, args.get("file_path")),
+}
+
+
+def run_read_only_tool(function_name, args, working_dir):
+    """Runs a tool from PARALLEL_SAFE_TOOLS and returns its result. Never touches the console."""
+    return READ_ONLY_TOOL_RUNNERS[function_name](args, working_dir)
+
+
+def report_read_only_tool(function_name, args, function_result, console):
+    """Prints the user-facing feedback line for a read-only tool result."""
+    if function_name == "get_files_info":
+        console.print(f"[dim]Checked directory tree[/dim]")
+    elif function_name == "get_file_content":
+        console.print(f"[dim]Read file: {args.get('file_path')}[/dim]")
+    elif function_name == "get_files_content":
+        file_paths = args.get("file_paths", [])
+        if isinstance(file_paths, str):
+            file_paths = [file_paths]
+        console.print(f"[dim]Read {len(file_paths)} files: {', '.join(file_paths)}[/dim]")
+    elif function_name == "web_search":
+        console.print(f"[dim]Searched web for: {args.get('query')}[/dim]")
+    elif function_name == "run_compiler":
+        if "FATAL SYNTAX ERROR" in function_result or "Error" in function_result:
+            console.print(Panel(function_result, title=f"Compile Failed: {args.get('file_path')}"))
+        else:
+            console.print(f"[bold]Success:[/bold] {function_result}")
+
+
+def _run_read_only_tool_safely(function_name, args, working_dir):
+    """Runs a read-only tool, turning an unexpected exception into an error result."""
+    try:
+        return run_read_only_tool(function_name, args, working_dir)
+    except Exception as e:
+        return f"Error: {function_name} failed: {e}"
+
+
+def execute_tools_parallel(tool_calls, working_dir, console):
+    """Executes a batch of (function_name, args) read-only tool calls concurrently.
+    
+    Latency drops from the sum of the calls to the slowest one. Identical calls
+    within the batch (same tool, same arguments) run once and share the result.
+    Results are returned in input order. Rich is not thread-safe, so workers only
+    compute results and all console output happens afterwards on the calling thread.
+    """
+    # Single-flight: collapse duplicate calls onto one execution
+    keys = [(name, tool_args_key(args)) for name, args in tool_calls]
+    unique_calls = dict(zip(keys, tool_calls))
+
+    with status(console, f"[bold]Executing {len(unique_calls)} tools in parallel...[/bold]"):
+        unique_results = dict(zip(unique_calls, EXECUTOR.map(
+            # One failing call must not discard the rest of the batch: every call in it
+            # needs a tool response, or the provider rejects the rest of the session
+            lambda tc: _run_read_only_tool_safely(tc[0], tc[1], working_dir),
+            unique_calls.values()
+        )))
+
+    for key, (function_name, args) in unique_calls.items():
+        report_read_only_tool(function_name, args, unique_results[key], console)
+    if len(unique_calls) < len(tool_calls):
+        console.print(f"[dim]Skipped {len(tool_calls) - len(unique_calls)} duplicate tool call(s)[/dim]")
+    return [unique_results[key] for key in keys]
+
+
+def _run_create_directory(args, working_dir, approve_all, console):
+    with status(console, "[bold]Executing create_directory...[/bold]"):
+        function_result = create_directory(working_dir, args.get("directory_path"))
+        # Nested creation can add an entry at every level, so drop each ancestor's listing
+        abs_working_directory = os.path.abspath(working_dir)
+        path = os.path.abspath(os.path.join(working_dir, args.get("directory_path") or "."))
+        while path.startswith(abs_working_directory + os.sep):
+            invalidate_file_info_cache(path)
+            path = os.path.dirname(path)
+        console.print(f"[dim]Created directory: {args.get('directory_path')}[/dim]")
+    return function_result
+
+
+def _run_write_file(args, working_dir, approve_all, console):
+    file_path = args.get("file_path")
+    content = args.get("content")
+    
+    # Preview and prompt under one lock, so a concurrent sub-agent's diff cannot
+    # land between this diff and the approval it belongs to
+    with console_lock:
         if not approve_all[0]:
             abs_path = os.path.join(os.path.abspath(working_dir), file_path)
             if os.path.isfile(abs_path):
@@ -251,79 +790,120 @@ def execute_tool(function_name, args, working_dir, approve_all, console):
             else:
                 console.print(f"[dim](new file — {len(content)} chars)[/dim]")
         
-        if ask_approval(console, f"Agent wants to write '{file_path}'", approve_all):
-            with console.status(f"[bold]Writing {file_path}...[/bold]", spinner="dots"):
-                function_result = write_file(working_dir, file_path, content)
-                console.print(f"[dim]Wrote file: {file_path}[/dim]")
-        else:
-            function_result = "SYSTEM ERROR: User denied permission to write file."
-
-    elif function_name == "edit_file":
-        file_path = args.get("file_path")
-        search = args.get("search", "")
-        replace = args.get("replace", "")
-        
+        approved = ask_approval(console, f"Agent wants to write '{file_path}'", approve_all)
+    if approved:
+        with status(console, f"[bold]Writing {file_path}...[/bold]"):
+            function_result = write_file(working_dir, file_path, content)
+            invalidate_file_info_cache(os.path.join(working_dir, file_path))
+            console.print(f"[dim]Wrote file: {file_path}[/dim]")
+        return function_result
+    return "SYSTEM ERROR: User denied permission to write file."
+
+
+def _run_edit_file(args, working_dir, approve_all, console):
+    file_path = args.get("file_path")
+    search = args.get("search", "")
+    replace = args.get("replace", "")
+    
+    # Preview and prompt under one lock (see _run_write_file)
+    with console_lock:
         if not approve_all[0]:
             show_diff(console, search, replace, file_path)
         
-        if ask_approval(console, f"Agent wants to edit '{file_path}'", approve_all):
-            with console.status(f"[bold]Editing {file_path}...[/bold]", spinner="dots"):
-                function_result = edit_file(working_dir, file_path, search, replace)
-                console.print(f"[dim]Edited file: {file_path}[/dim]")
+        approved = ask_approval(console, f"Agent wants to edit '{file_path}'", approve_all)
+    if approved:
+        with status(console, f"[bold]Editing {file_path}...[/bold]"):
+            function_result = edit_file(working_dir, file_path, search, replace)
+            invalidate_file_info_cache(os.path.join(working_dir, file_path))
+            console.print(f"[dim]Edited file: {file_path}[/dim]")
+        return function_result
+    return "SYSTEM ERROR: User denied permission to edit file."
+
+
+def _run_delete_file(args, working_dir, approve_all, console):
+    file_path = args.get("file_path")
+    
+    if ask_approval(console, f"Agent wants to delete '{file_path}'", approve_all):
+        with status(console, f"[bold]Deleting {file_path}...[/bold]"):
+            function_result = delete_file(working_dir, file_path)
+            invalidate_file_info_cache(os.path.join(working_dir, file_path))
+            console.print(f"[dim]Deleted file: {file_path}[/dim]")
+        return function_result
+    return "SYSTEM ERROR: User denied permission to delete file."
+
+
+def _run_python_file(args, working_dir, approve_all, console):
+    file_path = args.get("file_path")
+    script_args = args.get("args", [])
+    fast_mode = bool(args.get("fast_mode", False))
+    
+    if ask_approval(console, f"Agent wants to execute '{file_path}'", approve_all):
+        with status(console, f"[bold]Executing {file_path}...[/bold]"):
+            function_result = run_python_file(working_dir, file_path, script_args, fast_mode=fast_mode)
+        invalidate_file_info_cache()  # Scripts may have written anywhere in the tree
+        # Show execution output to the user in a visible panel
+        output_text = function_result.strip()
+        if "Error" in function_result or "Traceback" in function_result or "Process exited with code" in function_result:
+            console.print(Panel(output_text, title=f"Execution Failed: {file_path}"))
         else:
-            function_result = "SYSTEM ERROR: User denied permission to edit file." 
+            console.print(Panel(output_text, title=f"Execution Output: {file_path}"))
+        return function_result
+    return "SYSTEM ERROR: User denied permission."
 
-    elif function_name == "delete_file":
-        file_path = args.get("file_path")
-        
-        if ask_approval(console, f"Agent wants to delete '{file_path}'", approve_all):
-            with console.status(f"[bold]Deleting {file_path}...[/bold]", spinner="dots"):
-                function_result = delete_file(working_dir, file_path)
-                console.print(f"[dim]Deleted file: {file_path}[/dim]")
-        else:
-            function_result = "SYSTEM ERROR: User denied permission to delete file."
 
-    elif function_name == "run_python_file":
-        file_path = args.get("file_path")
-        script_args = args.get("args", [])
-        
-        if ask_approval(console, f"Agent wants to execute '{file_path}'", approve_all):
-            with console.status(f"[bold]Executing {file_path}...[/bold]", spinner="dots"):
-                function_result = run_python_file(working_dir, file_path, script_args)
-            # Show execution output to the user in a visible panel
-            output_text = function_result.strip()
-            if "Error" in function_result or "Traceback" in function_result or "Process exited with code" in function_result:
-                console.print(Panel(output_text, title=f"Execution Failed: {file_path}"))
-            else:
-                console.print(Panel(output_text, title=f"Execution Output: {file_path}"))
-        else:
-            function_result = "SYSTEM ERROR: User denied permission."
+def _run_install_package(args, working_dir, approve_all, console):
+    package_name = args.get("package_name")
     
-    elif function_name == "install_package":
-        package_name = args.get("package_name")
-        
-        if ask_approval(console, f"Agent wants to install package: '{package_name}'", approve_all):
-            with console.status(f"[bold]Installing {package_name}...[/bold]", spinner="dots"):
-                function_result = install_package(working_dir, package_name)
-                console.print(f"[dim]Installed: {package_name}[/dim]")
-        else:
-            function_result = "SYSTEM ERROR: User denied permission."
+    if ask_approval(console, f"Agent wants to install package: '{package_name}'", approve_all):
+        with status(console, f"[bold]Installing {package_name}...[/bold]"):
+            function_result = install_package(working_dir, package_name)
+            invalidate_file_info_cache()
+            console.print(f"[dim]Installed: {package_name}[/dim]")
+        return function_result
+    return "SYSTEM ERROR: User denied permission."
+
+
+def _run_update_tracker(args, working_dir, approve_all, console):
+    markdown_content = args.get("markdown_content", "")
+    function_result = write_progress(working_dir, markdown_content)
+    invalidate_file_info_cache(os.path.join(working_dir, "PROGRESS.md"))
+    console.print(f"[dim]Updated PROGRESS.md[/dim]")
+    return function_result
 
-    elif function_name == "update_tracker":
-        markdown_content = args.get("markdown_content", "")
-        function_result = write_progress(working_dir, markdown_content)
-        console.print(f"[dim]Updated PROGRESS.md[/dim]")
 
-    elif function_name == "ask_user":
-        question = args.get("question", "")
+def _run_ask_user(args, working_dir, approve_all, console):
+    question = args.get("question", "")
+    with console_lock:
         console.print("\n[bold]User Input Required:[/bold]")
         console.print(Markdown(question))
         user_feedback = console.input("\n[bold]Your response > [/bold]")
-        if user_feedback.lower() in ['exit', 'quit']:
-            return "Task aborted by user."
-        function_result = f"USER RESPONSE: {user_feedback}"
+    if user_feedback.lower() in ['exit', 'quit']:
+        return "Task aborted by user."
+    return f"USER RESPONSE: {user_feedback}"
 
-    else:
-        function_result = f"SYSTEM ERROR: Unknown tool '{function_name}' was called. This tool does not exist."
 
-    return function_result
+# Side-effecting and interactive tools: name -> handler(args, working_dir, approve_all, console)
+TOOL_HANDLERS = {
+    "create_directory": _run_create_directory,
+    "write_file": _run_write_file,
+    "edit_file": _run_edit_file,
+    "delete_file": _run_delete_file,
+    "run_python_file": _run_python_file,
+    "install_package": _run_install_package,
+    "update_tracker": _run_update_tracker,
+    "ask_user": _run_ask_user,
+}
+
+
+def execute_tool(function_name, args, working_dir, approve_all, console):
+    """Executes a single tool and returns the result string."""
+    if function_name in PARALLEL_SAFE_TOOLS:
+        with status(console, f"[bold]Executing {function_name}...[/bold]"):
+            function_result = run_read_only_tool(function_name, args, working_dir)
+            report_read_only_tool(function_name, args, function_result, console)
+        return function_result
+
+    handler = TOOL_HANDLERS.get(function_name)
+    if handler is None:
+        return f"SYSTEM ERROR: Unknown tool '{function_name}' was called. This tool does not exist."
+    return handler(args, working_dir, approve_all, console)
@@ -50,6 +50,24 @@ BASE_TOOLS = [
             }
         }
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_files_content",
+            "description": "Reads several files in a single call and returns each one's content under an `=== file: <path> ===` header. PREFER this over repeated `get_file_content` calls whenever you need more than one file.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "file_paths": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The EXACT relative paths of the files to read."
+                    }
+                },
+                "required": ["file_paths"]
+            }
+        }
+    },
     {
         "type": "function",
         "function": {
@@ -151,6 +169,10 @@ BASE_TOOLS = [
                         "type": "array",
                         "items": {"type": "string"},
                         "description": "Optional command-line arguments to pass to the script."
+                    },
+                    "fast_mode": {
+                        "type": "boolean",
+                        "description": "Optional. Starts Python without site-packages for a faster launch. Only for scripts that use nothing but the standard library."
                     }
                 },
                 "required": ["file_path"]
@@ -1,22 +1,38 @@
+import time
 import litellm
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 litellm.drop_params = True
 
 RETRY_EXCEPTIONS = (litellm.RateLimitError, litellm.ServiceUnavailableError, litellm.Timeout)
+MAX_ATTEMPTS = 5
 
-@retry(
-    stop=stop_after_attempt(5), 
-    wait=wait_exponential(multiplier=2, min=5, max=60), 
-    retry=retry_if_exception_type(RETRY_EXCEPTIONS),
-    before_sleep=lambda retry_state: print(f"  API rate limit or timeout. Retrying in {retry_state.next_action.sleep}s (attempt {retry_state.attempt_number}/5)...")
-)
-def safe_completion(model, messages, tools=None):
-    """Unified LLM completion wrapper with automatic retry on transient errors."""
+
+def retry_delay(attempt):
+    """Seconds to wait after a failed attempt: exponential from 5s, capped at 60s."""
+    return max(5, min(60, 2 * 2 ** (attempt - 1)))
+
+
+def safe_completion(model, messages, tools=None, stream=False):
+    """Unified LLM completion wrapper with automatic retry on transient errors.
+    
+    With stream=True, returns an iterator of chunks; the final chunk carries usage.
+    """
     kwargs = {
         "model": model,
         "messages": messages,
     }
     if tools:
         kwargs["tools"] = tools
-    return litellm.completion(**kwargs)
\ No newline at end of file
+    if stream:
+        kwargs["stream"] = True
+        kwargs["stream_options"] = {"include_usage": True}
+
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            return litellm.completion(**kwargs)
+        except RETRY_EXCEPTIONS:
+            if attempt == MAX_ATTEMPTS:
+                raise
+            delay = retry_delay(attempt)
+            print(f"  API rate limit or timeout. Retrying in {delay}s (attempt {attempt}/{MAX_ATTEMPTS})...")
+            time.sleep(delay)
@@ -0,0 +1,106 @@
+import os
+import time
+import codecs
+import threading
+from collections import OrderedDict
+
+# Decoded file contents kept in memory so a read followed by an edit (or repeated
+# reads of the same file) only touches the disk for an os.stat.
+# abs_path -> (st_mtime_ns, st_size, text), least recently used first.
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_cached_bytes = 0
+
+# Only files up to this size are cached, and the whole cache stays under the budget
+CACHE_MAX_FILE_BYTES = 1_000_000
+CACHE_MAX_TOTAL_BYTES = 32_000_000
+
+# Files modified this recently are not cached: a same-size rewrite landing within the
+# filesystem's timestamp granularity could otherwise leave (mtime, size) unchanged.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def get_cached(abs_path, st):
+    """Returns the cached text for abs_path if it still matches the given os.stat result."""
+    with _cache_lock:
+        entry = _cache.get(abs_path)
+        if entry is None or entry[0] != st.st_mtime_ns or entry[1] != st.st_size:
+            return None
+        _cache.move_to_end(abs_path)
+        return entry[2]
+
+
+def put(abs_path, st, text, check_racy=True):
+    """Caches text as the content of abs_path at the given os.stat result."""
+    global _cached_bytes
+    racy = check_racy and time.time_ns() - st.st_mtime_ns <= RACY_WINDOW_NS
+    if st.st_size > CACHE_MAX_FILE_BYTES or racy:
+        invalidate(abs_path)
+        return
+
+    with _cache_lock:
+        old = _cache.pop(abs_path, None)
+        if old is not None:
+            _cached_bytes -= old[1]
+        _cache[abs_path] = (st.st_mtime_ns, st.st_size, text)
+        _cached_bytes += st.st_size
+
+        while _cached_bytes > CACHE_MAX_TOTAL_BYTES:
+            _, evicted = _cache.popitem(last=False)  # Evict the least recently used file
+            _cached_bytes -= evicted[1]
+
+
+def invalidate(abs_path):
+    """Drops any cached content for abs_path."""
+    global _cached_bytes
+    with _cache_lock:
+        old = _cache.pop(abs_path, None)
+        if old is not None:
+            _cached_bytes -= old[1]
+
+
+def decode_text(raw, final=True):
+    """Decodes UTF-8 bytes exactly as a text-mode read would, newline translation included.
+
+    Reading bytes and decoding once skips TextIOWrapper's chunked decoder. With
+    final=False an incomplete multi-byte sequence at the end (from a bounded read)
+    is dropped instead of raising.
+    """
+    text = codecs.utf_8_decode(raw, "strict", final)[0]
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def read_text(abs_path, st=None):
+    """Reads a whole UTF-8 text file, served from the cache when it has not changed on disk.
+
+    Callers that already hold an os.stat result for the file can pass it as `st`.
+    """
+    if st is None:
+        st = os.stat(abs_path)
+    text = get_cached(abs_path, st)
+    if text is None:
+        with open(abs_path, "rb") as f:
+            text = decode_text(f.read())
+        put(abs_path, st, text)
+    return text
+
+
+def record_write(abs_path, text):
+    """Caches text just written to abs_path, so the next read does not go back to disk.
+
+    The racy-mtime check is skipped: the file was modified just now by design, and
+    the text is exactly what was written.
+    """
+    # Text mode reads translate "\r\n" and "\r" to "\n", so such content would not
+    # round-trip; leave it to be re-read instead.
+    if "\r" in text:
+        invalidate(abs_path)
+        return
+    try:
+        st = os.stat(abs_path)
+    except OSError:
+        invalidate(abs_path)
+        return
+    put(abs_path, st, text, check_racy=False)
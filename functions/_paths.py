@@ -0,0 +1,30 @@
+import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _working_dir_paths(working_directory):
+    """Returns (absolute path, absolute path with a trailing separator) for a working directory."""
+    abs_working_directory = os.path.abspath(working_directory)
+    # The root directory already ends with a separator
+    if abs_working_directory.endswith(os.sep):
+        return abs_working_directory, abs_working_directory
+    return abs_working_directory, abs_working_directory + os.sep
+
+
+def abs_working_dir(working_directory):
+    """Returns the absolute path of the working directory, computed once per session."""
+    return _working_dir_paths(working_directory)[0]
+
+
+def resolve_path(working_directory, path):
+    """Returns the absolute path of `path` inside the working directory, or None if it escapes.
+
+    Compares against the directory plus a separator, so a sibling like
+    "/work-evil" is not mistaken for a path inside "/work".
+    """
+    abs_working_directory, prefix = _working_dir_paths(working_directory)
+    abs_path = os.path.abspath(os.path.join(abs_working_directory, path))
+    if abs_path != abs_working_directory and not abs_path.startswith(prefix):
+        return None
+    return abs_path
@@ -1,17 +1,22 @@
 import os
+import stat
+
+from functions._paths import resolve_path
 
 def delete_file(working_directory: str, file_path: str):
-    abs_working_directory = os.path.abspath(working_directory)
-    abs_file_path = os.path.abspath(os.path.join(working_directory, file_path))
+    abs_file_path = resolve_path(working_directory, file_path)
 
     # Guardrail: Path validation against escaping the working directory
-    if not abs_file_path.startswith(abs_working_directory):
+    if abs_file_path is None:
         return f'Error: "{file_path}" is not in the working directory.' 
 
-    if not os.path.exists(abs_file_path):
+    # One stat answers both "does it exist" and "is it a file"
+    try:
+        st = os.stat(abs_file_path)
+    except OSError:
         return f'Error: File "{file_path}" does not exist.'
         
-    if not os.path.isfile(abs_file_path):
+    if not stat.S_ISREG(st.st_mode):
         return f'Error: "{file_path}" is a directory, not a file.'
 
     try:
@@ -1,16 +1,67 @@
 import os
-import difflib
+import mmap
+import stat
+import tempfile
+from itertools import accumulate
+from collections import Counter
+
+from functions._paths import resolve_path
+from functions._content_cache import read_text, record_write, invalidate, CACHE_MAX_FILE_BYTES
 
 
 def find_fuzzy_match(file_lines, search_lines, threshold=0.6):
-    """Slides a window over file_lines to find the best fuzzy match for search_lines."""
+    """Slides a window over file_lines to find the best fuzzy match for search_lines.
+
+    Every window has the same length as search_lines, so SequenceMatcher.ratio() is
+    bounded by (lines shared with search_lines, counted as a multiset) / search_len.
+    That count is maintained incrementally as the window slides, and the full
+    O(N·M) comparison only runs on windows whose bound could beat the best so far.
+    """
     best_ratio = 0
     best_start = -1
     search_len = len(search_lines)
+    if search_len == 0 or len(file_lines) < search_len:
+        return None
+
+    search_counts = Counter(search_lines)
+    window_counts = Counter()
+    shared = 0  # Size of the multiset intersection of the window and search_lines
+
+    def add(line):
+        nonlocal shared
+        if line in search_counts:
+            if window_counts[line] < search_counts[line]:
+                shared += 1
+            window_counts[line] += 1
+
+    def remove(line):
+        nonlocal shared
+        if line in search_counts:
+            window_counts[line] -= 1
+            if window_counts[line] < search_counts[line]:
+                shared -= 1
+
+    for line in file_lines[:search_len]:
+        add(line)
+
+    # search_lines is indexed once and reused for every window. Auto-junking is off:
+    # treating common lines (blank lines, closing braces) as junk only distorts a
+    # line-level similarity score.
+    import difflib  # Only needed when an exact match fails; kept off the startup path
+    matcher = difflib.SequenceMatcher(None, autojunk=False)
+    matcher.set_seq2(search_lines)
 
     for i in range(len(file_lines) - search_len + 1):
-        chunk = file_lines[i : i + search_len]
-        ratio = difflib.SequenceMatcher(None, chunk, search_lines).ratio()
+        if i:
+            remove(file_lines[i - 1])
+            add(file_lines[i + search_len - 1])
+
+        upper_bound = shared / search_len
+        if upper_bound <= best_ratio or upper_bound < threshold:
+            continue  # This window cannot become the accepted best match
+
+        matcher.set_seq1(file_lines[i : i + search_len])
+        ratio = matcher.ratio()
         if ratio > best_ratio:
             best_ratio = ratio
             best_start = i
@@ -20,31 +71,100 @@ def find_fuzzy_match(file_lines, search_lines, threshold=0.6):
     return None
 
 
+def atomic_write(abs_file_path, data):
+    """Writes str (UTF-8 text) or bytes to a file via a temp file and os.replace.
+
+    The original stays intact until the new content is fully written, so a crash
+    or a failed write never leaves a truncated file behind.
+    """
+    target = os.path.realpath(abs_file_path)  # Write through symlinks, like an in-place write
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".", suffix=".tmp")
+    try:
+        if isinstance(data, bytes):
+            f = os.fdopen(fd, "wb")
+        else:
+            f = os.fdopen(fd, "w", encoding="utf-8")
+        with f:
+            f.write(data)
+        # mkstemp creates the file as 0600; keep the original permissions
+        os.chmod(tmp_path, stat.S_IMODE(os.stat(target).st_mode))
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def replace_unique_mapped(abs_file_path, search, replace):
+    """Exact-match edit of a large file done on raw bytes through mmap.
+
+    Returns True if `search` occurred exactly once and was replaced, or False to
+    let the caller fall back to the text path (no match, several matches, or a file
+    where bytes and decoded text could disagree). Skips decoding the whole file
+    into a str just to look for the search block.
+    """
+    try:
+        search_bytes = search.encode("utf-8")
+        replace_bytes = replace.encode("utf-8")
+    except UnicodeEncodeError:
+        return False
+    if not search_bytes:
+        return False
+
+    with open(abs_file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Text-mode reads translate "\r\n", so bytes only match the same places the
+        # text path would when the file has no carriage returns at all
+        if mm.find(b"\r") >= 0:
+            return False
+        index = mm.find(search_bytes)
+        if index < 0 or mm.find(search_bytes, index + len(search_bytes)) >= 0:
+            return False
+        new_bytes = mm[:index] + replace_bytes + mm[index + len(search_bytes):]
+
+    if search_bytes != replace_bytes:
+        atomic_write(abs_file_path, new_bytes)
+        invalidate(abs_file_path)
+    return True
+
+
 def edit_file(working_directory: str, file_path: str, search: str, replace: str):
-    abs_working_directory = os.path.abspath(working_directory)
-    abs_file_path = os.path.abspath(os.path.join(working_directory, file_path))
+    abs_file_path = resolve_path(working_directory, file_path)
 
-    if not abs_file_path.startswith(abs_working_directory):
+    if abs_file_path is None:
         return f'Error: "{file_path}" is not in the working directory.' 
 
-    if not os.path.isfile(abs_file_path):
+    # One stat serves the existence check, the size check and the content cache lookup
+    try:
+        st = os.stat(abs_file_path)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
         return f"Error: '{file_path}' does not exist. Use `write_file` to create a new file."
 
     try:
-        with open(abs_file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        # Files too large for the content cache try a byte-level exact match first
+        if st.st_size > CACHE_MAX_FILE_BYTES and replace_unique_mapped(abs_file_path, search, replace):
+            return f'Successfully edited "{file_path}" (exact match). Replaced a {len(search)} char block with a {len(replace)} char block.'
+
+        content = read_text(abs_file_path, st)
 
-        # Attempt 1: Exact match
-        if search in content:
-            count = content.count(search)
-            if count > 1:
+        # Attempt 1: Exact match. A second find() from the end of the first hit is
+        # enough to prove uniqueness (with the same non-overlapping semantics as
+        # count()), and stops early instead of scanning to EOF.
+        index = content.find(search)
+        if index >= 0:
+            if content.find(search, index + len(search)) >= 0:
+                count = content.count(search)  # Only on the error path, for the message
                 return (
                     f"Error: The search string occurs {count} times in the file. "
                     f"Please provide a more specific search string that uniquely identifies the block to replace."
                 )
-            new_content = content.replace(search, replace)
-            with open(abs_file_path, "w", encoding="utf-8") as f:
-                f.write(new_content)
+            new_content = content[:index] + replace + content[index + len(search):]
+            if new_content != content:
+                atomic_write(abs_file_path, new_content)
+                record_write(abs_file_path, new_content)
             return f'Successfully edited "{file_path}" (exact match). Replaced a {len(search)} char block with a {len(replace)} char block.'
 
         # Attempt 2: Fuzzy match using difflib
@@ -65,15 +185,15 @@ def edit_file(working_directory: str, file_path: str, search: str, replace: str)
 
         start, length, ratio = match
 
-        original_chunk = "".join(file_lines[start : start + length])
-
-        # Replace the matched region
+        # Replace the matched region. The lines keep their endings, so line i starts at
+        # offsets[i] in content and the region can be spliced in without re-joining every line.
+        offsets = list(accumulate(map(len, file_lines), initial=0))
         replace_with_newline = replace if replace.endswith("\n") else replace + "\n"
-        new_lines = file_lines[:start] + [replace_with_newline] + file_lines[start + length :]
-        new_content = "".join(new_lines)
+        new_content = content[:offsets[start]] + replace_with_newline + content[offsets[start + length]:]
 
-        with open(abs_file_path, "w", encoding="utf-8") as f:
-            f.write(new_content)
+        if new_content != content:
+            atomic_write(abs_file_path, new_content)
+            record_write(abs_file_path, new_content)
 
         return (
             f'Successfully edited "{file_path}" (fuzzy match, {ratio:.0%} similarity). '
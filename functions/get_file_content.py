@@ -1,14 +1,22 @@
 import os
 
+from functions._paths import resolve_path
+from functions._content_cache import get_cached, put, decode_text, CACHE_MAX_FILE_BYTES
+
 # Maximum characters allowed for certain string operations to prevent memory issues
 MAX_CHARS = 10000
 
+# A UTF-8 character is at most 4 bytes, so this many bytes always covers MAX_CHARS characters
+MAX_READ_BYTES = MAX_CHARS * 4
+
 def get_file_content(working_directory, file_path):
-    abs_working_directory = os.path.abspath(working_directory)
-    abs_file_path = os.path.abspath(os.path.join(working_directory, file_path))
+    if not isinstance(file_path, str):
+        return f"Error: {file_path!r} is not a valid file path."
+
+    abs_file_path = resolve_path(working_directory, file_path)
 
     # Prevent the agent from trying to read system files outside the workspace
-    if not abs_file_path.startswith(abs_working_directory):
+    if abs_file_path is None:
         return f'Error: "{file_path}" is not in the working directory.' 
 
     # Verify the file actually exists on disk
@@ -19,19 +27,52 @@ def get_file_content(working_directory, file_path):
     file_content_string = ""
 
     try: 
-        # Open in read mode
-        with open(abs_file_path, "r", encoding="utf-8") as f:
+        st = os.stat(abs_file_path)
+        cached = get_cached(abs_file_path, st)
+        if cached is not None:
+            file_content_string = cached[:MAX_CHARS]
+        elif st.st_size <= CACHE_MAX_FILE_BYTES:
+            # Small enough to keep whole: read it once so a following edit can reuse it
+            with open(abs_file_path, "rb") as f:
+                raw = f.read()
+            try:
+                full_text = decode_text(raw)
+                put(abs_file_path, st, full_text)
+                file_content_string = full_text[:MAX_CHARS]
+            except UnicodeDecodeError:
+                # Undecodable somewhere; the beginning may still be readable
+                file_content_string = decode_text(raw[:MAX_READ_BYTES], final=False)[:MAX_CHARS]
+        else:
             # Only read up to the maximum characters limit to avoid massive context bloating
-            file_content_string = f.read(MAX_CHARS)
+            with open(abs_file_path, "rb") as f:
+                file_content_string = decode_text(f.read(MAX_READ_BYTES), final=False)[:MAX_CHARS]
 
-            # Inform the AI if the file was truncated so it is aware it's only seeing part of it
-            if len(file_content_string) >= MAX_CHARS:
-                file_content_string += (
-                    f'[...File "{file_path}" truncated at 10000 characters]'
-                    )
+        # Inform the AI if the file was truncated so it is aware it's only seeing part of it
+        if len(file_content_string) >= MAX_CHARS:
+            file_content_string += (
+                f'[...File "{file_path}" truncated at 10000 characters]'
+                )
 
 
         return file_content_string
     
     except Exception as e:
-        return f"Exception reading file: {e}"
\ No newline at end of file
+        return f"Exception reading file: {e}"
+
+def get_files_content(working_directory, file_paths):
+    """Reads several files in one call, each under its own `=== file: <path> ===` header."""
+    # Tolerate a single path passed as a plain string
+    if isinstance(file_paths, str):
+        file_paths = [file_paths]
+
+    if not file_paths:
+        return "Error: No file paths were provided."
+
+    if not isinstance(file_paths, list):
+        return "Error: file_paths must be a list of file paths."
+
+    sections = []
+    for file_path in file_paths:
+        # A bad entry (e.g. null) gets its own error section instead of failing the whole call
+        sections.append(f"=== file: {file_path} ===\n{get_file_content(working_directory, file_path)}")
+    return "\n\n".join(sections)
@@ -1,13 +1,100 @@
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from functions._paths import abs_working_dir, resolve_path
+
+# CRITICAL: Ignore these folders so they don't blow up the context window!
+IGNORE_DIRS = {'.venv', 'venv', 'env', '__pycache__', '.git', 'node_modules', '.idea', '.vscode', '.agent_cache'}
+
+# Per-directory listing cache: abs_dir -> (st_mtime_ns, [(file_name, size)], [subdir_name]).
+# Adding, removing or renaming an entry bumps the directory's mtime, so an unchanged
+# mtime means the listing can be reused without touching its files. Rewriting an
+# existing file does NOT bump it, so file-modifying tools call invalidate_file_info_cache().
+_dir_cache = {}
+
+# Directories modified this recently are not cached: a change landing within the
+# filesystem's timestamp granularity could otherwise leave the mtime unchanged.
+RACY_WINDOW_NS = 2_000_000_000
+
+# Scans uncached directories concurrently; threads are only started on first use.
+# Deliberately separate from agent_helpers.EXECUTOR: get_file_info itself runs on
+# EXECUTOR workers (read-only batches, sub-agents) and blocks on these scans, so
+# sharing that pool could starve it of the workers the scans need.
+_walk_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="file-walk")
+
+
+def invalidate_file_info_cache(path=None):
+    """Drops the cached listing of the directory containing `path`, or every listing if None."""
+    if path is None:
+        _dir_cache.clear()
+    else:
+        _dir_cache.pop(os.path.dirname(os.path.abspath(path)), None)
+
+
+def _scan_directory(abs_dir, mtime):
+    """Returns ([(file_name, size)], [subdir_name]) for one directory read from disk."""
+    files, subdirs = [], []
+    try:
+        # scandir reports each entry's type from the directory read itself, so only
+        # files need a stat (for their size) and directories need none
+        with os.scandir(abs_dir) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        # Like os.walk, never descend into symlinked directories
+                        if entry.name not in IGNORE_DIRS and not entry.is_symlink():
+                            subdirs.append(entry.name)
+                    else:
+                        files.append((entry.name, entry.stat().st_size))
+                except OSError:
+                    continue  # Broken symlink or entry removed mid-walk
+    except OSError:
+        return files, subdirs
+
+    if time.time_ns() - mtime > RACY_WINDOW_NS:
+        _dir_cache[abs_dir] = (mtime, files, subdirs)
+    return files, subdirs
+
+
+def _list_directories(abs_dirs):
+    """Returns {abs_dir: ([(file_name, size)], [subdir_name])}, reusing cached listings when unchanged.
+
+    Directories that have to be read from disk are scanned concurrently, so on a
+    cold cache the walk overlaps directory I/O instead of waiting on each read in turn.
+    """
+    listings = {}
+    misses = []
+    for abs_dir in abs_dirs:
+        try:
+            mtime = os.stat(abs_dir).st_mtime_ns
+        except OSError:
+            listings[abs_dir] = ([], [])
+            continue
+
+        cached = _dir_cache.get(abs_dir)
+        if cached is not None and cached[0] == mtime:
+            listings[abs_dir] = (cached[1], cached[2])
+        else:
+            misses.append((abs_dir, mtime))
+
+    if len(misses) > 1:
+        scanned = _walk_pool.map(lambda miss: _scan_directory(*miss), misses)
+    else:
+        scanned = (_scan_directory(*miss) for miss in misses)
+    for (abs_dir, _), listing in zip(misses, scanned):
+        listings[abs_dir] = listing
+    return listings
+
 
 def get_file_info(working_directory: str, directory="."):
-    abs_working_directory = os.path.abspath(working_directory)
-    abs_directory = os.path.abspath(os.path.join(working_directory, directory))
+    abs_working_directory = abs_working_dir(working_directory)
+    abs_directory = resolve_path(working_directory, directory)
 
     # Guardrail 1: Prevent escaping the working directory
-    if not abs_directory.startswith(abs_working_directory):
-        return f'Error: "{directory}" is not in the working directory.'   
-    
+    if abs_directory is None:
+        return f'Error: "{directory}" is not in the working directory.'
+
     # Guardrail 2: Check if the path actually exists
     if not os.path.exists(abs_directory):
         return f"Error: The directory '{directory}' does not exist."
@@ -15,32 +102,40 @@ def get_file_info(working_directory: str, directory="."):
     if not os.path.isdir(abs_directory):
         return f"Error: '{directory}' is a file, not a directory."
 
-    # CRITICAL: Ignore these folders so they don't blow up the context window!
-    IGNORE_DIRS = {'.venv', 'venv', 'env', '__pycache__', '.git', 'node_modules', '.idea', '.vscode'}
-
-    final_response = f"📂 Project Structure (Relative to Workspace Root):\n\n"
-    
-    is_empty = True
-
-    # os.walk recursively goes through all subdirectories
-    for root, dirs, files in os.walk(abs_directory):
-        # Modify the 'dirs' list in-place to skip ignored directories entirely
-        dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
-
-        for file in files:
-            is_empty = False
-            file_path = os.path.join(root, file)
-            
-            # Get the path RELATIVE TO THE WORKING DIRECTORY.
-            # This is crucial so the LLM knows the exact string to use in other tools!
-            rel_path = os.path.relpath(file_path, abs_working_directory)
-            size = os.path.getsize(file_path)
-
-            # Append to our final response string
-            final_response += f"- {rel_path} (Size: {size} bytes)\n"
-            
+    # Collected as a list and joined once: repeated += is quadratic on large trees
+    parts = ["📂 Project Structure (Relative to Workspace Root):\n\n"]
+
+    # Paths are reported RELATIVE TO THE WORKING DIRECTORY.
+    # This is crucial so the LLM knows the exact string to use in other tools!
+    # The prefix is computed once and extended per level instead of calling relpath per file.
+    start_rel = os.path.relpath(abs_directory, abs_working_directory)
+    start_prefix = "" if start_rel == "." else start_rel + os.sep
+
+    # Read the tree one level at a time, so every uncached directory on a level is
+    # scanned in parallel
+    listings = {}
+    level = [abs_directory]
+    while level:
+        level_listings = _list_directories(level)
+        listings.update(level_listings)
+        level = [os.path.join(root, d) for root in level for d in level_listings[root][1]]
+
+    # Emit top-down (files first, then subdirectories), in listing order
+    pending = [(abs_directory, start_prefix)]
+    while pending:
+        root, rel_prefix = pending.pop()
+        files, subdirs = listings[root]
+
+        for file, size in files:
+            parts.append(f"- {rel_prefix}{file} ({size} bytes)\n")
+
+        # Reversed so the stack pops subdirectories in listing order
+        pending.extend(
+            (os.path.join(root, d), f"{rel_prefix}{d}{os.sep}") for d in reversed(subdirs)
+        )
+
     # Provide a clear message if no files were found
-    if is_empty:
+    if len(parts) == 1:
         return f"The directory '{directory}' is completely empty."
 
-    return final_response
\ No newline at end of file
+    return "".join(parts)
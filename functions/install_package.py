@@ -1,15 +1,29 @@
 import os
+import shutil
 import subprocess
 
+# Resolved once per session so each install skips the $PATH search
+_uv_path = None
+
+
+def get_uv_path():
+    """Returns the absolute path of the uv executable, falling back to a bare "uv"."""
+    global _uv_path
+    if _uv_path is None:
+        _uv_path = shutil.which("uv")  # A miss is not cached, so installing uv mid-session works
+    return _uv_path or "uv"
+
+
 def install_package(working_directory: str, package_name: str):
     """Installs a Python package using uv."""
     abs_working_directory = os.path.abspath(working_directory)
     
     try:
         # Split by space in case the agent tries to install multiple packages at once
-        packages = package_name.strip().split()
-        # Use uv package manager which is extremely fast
-        command = ["uv", "add"] + packages
+        # Drop repeats (keeping order) so uv does not resolve the same requirement twice
+        packages = list(dict.fromkeys(package_name.strip().split()))
+        # Use uv package manager which is extremely fast; progress bars are only noise in captured output
+        command = [get_uv_path(), "add", "--no-progress"] + packages
         
         # Run the command and capture the output so the AI can verify success or read errors
         output = subprocess.run(
@@ -1,28 +1,39 @@
 import os
 
+from functions._content_cache import get_cached, read_text, record_write
+
 PROGRESS_FILENAME = "PROGRESS.md"
 
 
 def get_progress(working_directory: str):
     """Reads the current PROGRESS.md content, or returns a prompt to create it."""
-    progress_path = os.path.join(working_directory, PROGRESS_FILENAME)
-
-    if not os.path.exists(progress_path):
-        return "No PROGRESS.md exists yet. Use the `update_tracker` tool to initialize project tracking."
+    progress_path = os.path.abspath(os.path.join(working_directory, PROGRESS_FILENAME))
 
     try:
-        with open(progress_path, "r", encoding="utf-8") as f:
-            return f.read()
+        # write_progress records what it saved, so reading back after an update is
+        # served from the content cache instead of the disk
+        return read_text(progress_path)
+    except FileNotFoundError:
+        return "No PROGRESS.md exists yet. Use the `update_tracker` tool to initialize project tracking."
     except Exception as e:
         return f"Error reading PROGRESS.md: {e}"
 
 
 def write_progress(working_directory: str, markdown_content: str):
-    """Writes the full PROGRESS.md content to disk."""
-    progress_path = os.path.join(working_directory, PROGRESS_FILENAME)
+    """Writes the full PROGRESS.md content to disk, skipping the write if it is unchanged."""
+    progress_path = os.path.abspath(os.path.join(working_directory, PROGRESS_FILENAME))
     try:
+        # The tracker is often re-saved with identical content; the content cache knows
+        # what was last written and whether the file has been touched since
+        try:
+            if get_cached(progress_path, os.stat(progress_path)) == markdown_content:
+                return "Successfully saved PROGRESS.md."
+        except FileNotFoundError:
+            pass
+
         with open(progress_path, "w", encoding="utf-8") as f:
             f.write(markdown_content)
+        record_write(progress_path, markdown_content)
         return "Successfully saved PROGRESS.md."
     except Exception as e:
         return f"Failed to save PROGRESS.md: {e}"
\ No newline at end of file
@@ -1,25 +1,61 @@
 import os
-import py_compile
+import stat
+import time
+import traceback
+from functools import lru_cache
+
+from functions._paths import resolve_path
+
+# Files modified this recently are checked without memoizing: a same-size rewrite
+# within the filesystem's timestamp granularity could leave (mtime, size) unchanged.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+@lru_cache(maxsize=512)
+def _compile_check(abs_file_path, mtime_ns, size):
+    """Returns None if the file compiles, or the syntax error. Memoized per file version.
+
+    Compiles in memory with the builtin compile(), so no .pyc is written to
+    __pycache__ as py_compile would. The error text has the same format.
+    """
+    with open(abs_file_path, "rb") as f:
+        source = f.read()
+    try:
+        compile(source, abs_file_path, "exec", dont_inherit=True)
+        return None
+    except (SyntaxError, ValueError) as e:
+        return "".join(traceback.format_exception_only(type(e), e))
+
 
 def run_compiler(working_directory: str, file_path: str):
-    abs_working_directory = os.path.abspath(working_directory)
-    abs_file_path = os.path.abspath(os.path.join(working_directory, file_path))
+    abs_file_path = resolve_path(working_directory, file_path)
 
-    if not abs_file_path.startswith(abs_working_directory):
+    if abs_file_path is None:
         return f'Error: "{file_path}" is not in the working directory.' 
 
-    if not os.path.isfile(abs_file_path):
+    # One stat validates the path and keys the compile memo below
+    try:
+        st = os.stat(abs_file_path)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
         return f'Error: "{file_path}" is not a valid file.'
     
-    if not file_path.endswith(".py"):
+    # Checked on the resolved path and case-insensitively, so "script.PY" is accepted
+    if os.path.splitext(abs_file_path)[1].lower() != ".py":
          return f"Error: '{file_path}' is not a Python File. Compilers are for Python code."
 
     # Basic Syntax Check (Catches missing colons, bad indents instantly)
     # This prevents the LLM from making basic python mistakes that crash scripts immediately
     try:
-        py_compile.compile(abs_file_path, doraise=True)
-        return f"Compiler passed perfectly for '{file_path}'. No syntax errors found."
-    except py_compile.PyCompileError as e:
-        return f"FATAL SYNTAX ERROR:\n{e}"
+        # Unchanged files (same mtime and size) reuse the previous result
+        if time.time_ns() - st.st_mtime_ns <= RACY_WINDOW_NS:
+            error = _compile_check.__wrapped__(abs_file_path, st.st_mtime_ns, st.st_size)
+        else:
+            error = _compile_check(abs_file_path, st.st_mtime_ns, st.st_size)
+
+        if error is None:
+            return f"Compiler passed perfectly for '{file_path}'. No syntax errors found."
+        return f"FATAL SYNTAX ERROR:\n{error}"
     except Exception as e:
         return f"Error executing compiler subprocess: {e}"
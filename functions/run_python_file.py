@@ -1,59 +1,134 @@
 import os
 import subprocess
 import sys 
+import threading
+from collections import deque
 
-def run_python_file(working_directory: str, file_path: str, args = []):
-    abs_working_directory = os.path.abspath(working_directory)
-    abs_file_path = os.path.abspath(os.path.join(working_directory, file_path))
+from functions._paths import abs_working_dir, resolve_path
 
-    if not abs_file_path.startswith(abs_working_directory):
+# Only the last MAX_LINES lines of each stream are returned (tracebacks put the main
+# error at the end), and a script printing more than MAX_OUTPUT_CHARS to either stream is killed
+MAX_LINES = 50
+MAX_OUTPUT_CHARS = 1_000_000
+READ_CHUNK_CHARS = 8192
+OVERFLOW_TAIL_CHARS = 10_000
+
+# Interpreter command prefixes, built once at import and copied per run
+PYTHON_CMD = (sys.executable,)
+# Opt-in quick start for stdlib-only scripts: skip site (and site-packages) and .pyc writes
+FAST_PYTHON_CMD = (sys.executable, "-S", "-B")
+
+
+class OutputTail:
+    """Keeps the last MAX_LINES lines of a child's output stream in bounded memory.
+
+    A helper to prevent massive print statements from bloating context and crashing
+    the AI, without first buffering everything a runaway script prints.
+    """
+
+    def __init__(self, process):
+        self.process = process
+        self.lines = deque(maxlen=MAX_LINES)
+        self.line_count = 0
+        self.total_chars = 0
+        self.overflowed = False
+
+    def drain(self, stream):
+        """Reads the stream to EOF; runs on its own thread."""
+        # Bounded reads, so even one enormous line is counted (and can be cut off) as it arrives
+        for chunk in iter(lambda: stream.readline(READ_CHUNK_CHARS), ""):
+            if self.lines and not self.lines[-1].endswith("\n"):
+                self.lines[-1] += chunk  # Rest of a line longer than one read
+            else:
+                self.lines.append(chunk)
+                self.line_count += 1
+            self.total_chars += len(chunk)
+            if self.total_chars > MAX_OUTPUT_CHARS and not self.overflowed:
+                self.overflowed = True
+                self.process.kill()
+        stream.close()
+
+    def text(self):
+        if self.line_count <= MAX_LINES:
+            text = "".join(self.lines)
+        else:
+            text = (
+                f"... (truncated {self.line_count - MAX_LINES} previous lines) ...\n"
+                + "\n".join(line.rstrip("\n") for line in self.lines)
+            )
+        # A killed runaway may have left one giant line; only its end is useful
+        if self.overflowed and len(text) > OVERFLOW_TAIL_CHARS:
+            text = f"... (truncated {len(text) - OVERFLOW_TAIL_CHARS:,} previous characters) ...\n" + text[-OVERFLOW_TAIL_CHARS:]
+        return text
+
+
+def run_python_file(working_directory: str, file_path: str, args = [], fast_mode=False):
+    abs_working_directory = abs_working_dir(working_directory)
+    abs_file_path = resolve_path(working_directory, file_path)
+
+    if abs_file_path is None:
         return f'Error: "{file_path}" is not in the working directory.' 
 
     if not os.path.isfile(abs_file_path):
         return f'Error: "{file_path}" is not a valid file.'
     
-    if not file_path.endswith(".py"):
+    # Checked on the resolved path and case-insensitively, so "script.PY" is accepted
+    if os.path.splitext(abs_file_path)[1].lower() != ".py":
          return f"Error: '{file_path}' is not a Python File."
     
     try:
         # Prepare the standard execution command (e.g. python script.py)
-        final_args = [sys.executable, file_path]
-        final_args.extend(args)
+        final_args = [*PYTHON_CMD, file_path, *args]
+        env = None
+        if fast_mode:
+            # A fixed hash seed keeps set/dict ordering reproducible
+            final_args = [*FAST_PYTHON_CMD, file_path, *args]
+            env = {**os.environ, "PYTHONHASHSEED": "0"}
         
-        # Run the constructed command
-        output = subprocess.run(
+        # Run the constructed command, streaming its output instead of buffering all of it
+        process = subprocess.Popen(
             final_args, 
-            timeout=30, # Hard timeout so infinite loops don't lock up the agent
-            capture_output=True, # Capture both stdout and stderr for analysis
+            stdout=subprocess.PIPE, # Capture both stdout and stderr for analysis
+            stderr=subprocess.PIPE,
             text=True, # Decode bytes into string format
+            errors="replace",
+            bufsize=-1, # Fully buffered pipes: large outputs are read in blocks, not per write
             cwd=abs_working_directory,
+            env=env,
             stdin=subprocess.DEVNULL # Prevent commands from hanging indefinitely waiting for human input
         )
-        
-        # --- NEW: Truncation Logic ---
-        # A helper function to prevent massive print statements from bloating context and crashing the AI
-        def truncate(text, max_lines=50):
-            if not text:
-                return ""
-            lines = text.splitlines()
-            if len(lines) > max_lines:
-                # Keep the bottom N lines, as tracebacks put the main error at the end!
-                return f"... (truncated {len(lines) - max_lines} previous lines) ...\n" + "\n".join(lines[-max_lines:])
-            return text
-
-        safe_stdout = truncate(output.stdout)
-        safe_stderr = truncate(output.stderr)
-        # -----------------------------
+        stdout_tail, stderr_tail = OutputTail(process), OutputTail(process)
+        readers = [
+            threading.Thread(target=stdout_tail.drain, args=(process.stdout,), daemon=True),
+            threading.Thread(target=stderr_tail.drain, args=(process.stderr,), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        try:
+            returncode = process.wait(timeout=30) # Hard timeout so infinite loops don't lock up the agent
+        except subprocess.TimeoutExpired:
+            process.kill()
+            raise
+        finally:
+            for reader in readers:
+                reader.join()
+
+        safe_stdout = stdout_tail.text()
+        safe_stderr = stderr_tail.text()
 
         final_string =  f"""
 STDOUT: {safe_stdout}
 STDERR: {safe_stderr}
 """
-        if output.stdout == "" and output.stderr == "":
+        if stdout_tail.total_chars == 0 and stderr_tail.total_chars == 0:
             final_string += "No Output Produced.\n"
 
-        if output.returncode != 0:
-            final_string += f"Process exited with code {output.returncode}."
+        if stdout_tail.overflowed or stderr_tail.overflowed:
+            final_string += f"Output exceeded {MAX_OUTPUT_CHARS:,} characters; the process was killed.\n"
+
+        if returncode != 0:
+            final_string += f"Process exited with code {returncode}."
 
         return final_string
 
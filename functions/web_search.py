@@ -1,25 +1,127 @@
 # functions/web_search.py
 import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import closing
 from tavily import TavilyClient
 
-def web_search(query: str, max_results: int = 5):
-    """Searches the web using Tavily and returns a formatted string of results."""
+# Cached search results are reused for a day, then fetched again
+CACHE_TTL_SECONDS = 24 * 60 * 60
+CACHE_FILENAME = "web.sqlite"
+
+
+# Query terms: words plus the symbols common in technical names (c++, c#, node.js, utf-8)
+QUERY_TERM_RE = re.compile(r"\w[\w.+#-]*")
+
+
+def normalize_query(query):
+    """Reduces a query to its lowercased terms, in their original order.
+
+    Rephrasings that differ only in case, punctuation or spacing
+    ("Python requests tutorial" / "python, requests  tutorial?") share one cache
+    entry. Word order is kept: "convert int to string" and "convert string to int"
+    ask different questions.
+    """
+    return " ".join(QUERY_TERM_RE.findall(query.lower()))
+
+
+def _cache_key(query, max_results):
+    normalized = normalize_query(query)
+    return hashlib.blake2b(f"{normalized}\0{max_results}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _open_cache(cache_dir):
+    """Opens (creating if needed) the search cache database in cache_dir."""
+    os.makedirs(cache_dir, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(cache_dir, CACHE_FILENAME), timeout=5)
+    conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, ts INTEGER, body TEXT)")
+    return conn
+
+
+def _cache_get(cache_dir, key):
+    try:
+        with closing(_open_cache(cache_dir)) as conn:
+            row = conn.execute(
+                "SELECT body FROM cache WHERE key = ? AND ts > ?",
+                (key, int(time.time()) - CACHE_TTL_SECONDS),
+            ).fetchone()
+        return row[0] if row else None
+    except (sqlite3.Error, OSError):
+        return None  # A broken or uncreatable cache must never break searching
+
+
+def _cache_put(cache_dir, key, body):
     try:
-        client = TavilyClient(api_key=os.environ.get("TAVILY_API_KEY"))
-        response = client.search(query=query, max_results=max_results)
+        with closing(_open_cache(cache_dir)) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, ts, body) VALUES (?, ?, ?)",
+                (key, int(time.time()), body),
+            )
+    except (sqlite3.Error, OSError):
+        pass
+
+
+# One client for the whole session, created on the first search that misses the cache
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = TavilyClient(api_key=os.environ.get("TAVILY_API_KEY"))
+        return _client
+
+
+def _reset_client():
+    """Drops the shared client after a failure, so the next search reconnects from scratch."""
+    global _client
+    with _client_lock:
+        _client = None
+
+
+def web_search(query: str, max_results: int = 5, cache_dir=None):
+    """Searches the web using Tavily and returns a formatted string of results.
+
+    With cache_dir set, results are cached on disk so repeated queries skip the
+    network round trip (and the rate limit) for CACHE_TTL_SECONDS.
+    """
+    try:
+        # Inside the try: a malformed query (e.g. None) must come back as an error string
+        key = _cache_key(query, max_results)
+        if cache_dir:
+            cached = _cache_get(cache_dir, key)
+            if cached is not None:
+                return cached
+
+        try:
+            response = _get_client().search(query=query, max_results=max_results)
+        except Exception:
+            _reset_client()
+            raise
         results = response.get("results", [])
 
         if not results:
             return f"No results found for '{query}'."
 
-        formatted_results = f"--- Search Results for '{query}' ---\n\n"
+        parts = [f"--- Search Results for '{query}' ---\n\n"]
 
         for i, res in enumerate(results):
-            formatted_results += f"{i+1}. {res.get('title', 'No Title')}\n"
-            formatted_results += f"   URL: {res.get('url', 'No URL')}\n"
-            formatted_results += f"   Snippet: {res.get('content', 'No Snippet')}\n\n"
+            parts.append(
+                f"{i+1}. {res.get('title', 'No Title')}\n"
+                f"   URL: {res.get('url', 'No URL')}\n"
+                f"   Snippet: {res.get('content', 'No Snippet')}\n\n"
+            )
+
+        formatted_results = "".join(parts)
 
+        if cache_dir:
+            _cache_put(cache_dir, key, formatted_results)
         return formatted_results
 
     except Exception as e:
-        return f"Error performing web search: {e}"
\ No newline at end of file
+        return f"Error performing web search: {e}"
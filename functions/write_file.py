@@ -1,11 +1,13 @@
 import os
 
+from functions._paths import resolve_path
+from functions._content_cache import record_write
+
 def write_file(working_directory: str, file_path: str, content: str):
-    abs_working_directory = os.path.abspath(working_directory)
-    abs_file_path = os.path.abspath(os.path.join(working_directory, file_path))
+    abs_file_path = resolve_path(working_directory, file_path)
 
     # Guardrail: Path validation
-    if not abs_file_path.startswith(abs_working_directory):
+    if abs_file_path is None:
         return f'Error: "{file_path}" is not in the working directory.' 
 
     # Find out which folder this file is attempting to be placed inside
@@ -17,9 +19,19 @@ def write_file(working_directory: str, file_path: str, content: str):
         return f"Error: Parent directory '{os.path.relpath(parent_dir, working_directory)}' does not exist. Create it first using `create_directory`."
 
     try:
-        # Write mode will completely overwrite the previous file
-        with open(abs_file_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        # Encode once and hand the bytes straight to the OS, bypassing the buffered text
+        # layer. Text mode would translate "\n" to the platform line ending, so do the same.
+        text = content if os.linesep == "\n" else content.replace("\n", os.linesep)
+        data = memoryview(text.encode("utf-8"))
+
+        # O_TRUNC: write mode will completely overwrite the previous file
+        fd = os.open(abs_file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666)
+        try:
+            while data:
+                data = data[os.write(fd, data):]  # os.write may write less than asked
+        finally:
+            os.close(fd)
+        record_write(abs_file_path, content)
         return f'Successfully wrote entire file to "{file_path}" ({len(content)} characters).'
     
     except Exception as e:
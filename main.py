@@ -1,9 +1,12 @@
 import os
+import re
 import argparse
+from functools import lru_cache
 from dotenv import load_dotenv
 from rich.console import Console
 
 from agent import get_initial_messages, run_agent_loop
+from agent_helpers import release_history
 from token_tracker import TokenTracker, get_max_context_tokens
 
 PROVIDER_KEY_MAP = {
@@ -14,12 +17,40 @@ PROVIDER_KEY_MAP = {
     "gemini/": "GEMINI_API_KEY",
 }
 
+# All provider prefixes as one anchored alternation, tried in PROVIDER_KEY_MAP order
+PROVIDER_PREFIX_RE = re.compile("|".join(re.escape(prefix) for prefix in PROVIDER_KEY_MAP))
+
+@lru_cache(maxsize=64)
 def resolve_api_key_env(model_name):
     """Returns the env var name required for the given model, or None if not needed."""
-    for prefix, env_var in PROVIDER_KEY_MAP.items():
-        if model_name.startswith(prefix):
-            return env_var
-    return None
+    match = PROVIDER_PREFIX_RE.match(model_name)
+    return PROVIDER_KEY_MAP[match.group(0)] if match else None
+
+# REPL prompt and exit words, built once instead of on every loop iteration
+USER_PROMPT = "\n[bold blue]You > [/bold blue]"
+EXIT_COMMANDS = frozenset({"exit", "quit"})
+
+# Pure thank-yous need no model round-trip. Words like "ok", "yes" or "continue" are
+# left out on purpose: they often answer a question the agent just asked.
+THANKS_INPUTS = frozenset({"thanks", "thank you", "thanks!", "thank you!", "thx", "ty"})
+
+
+def clear_screen(console, tracker):
+    """Clears the terminal in-process, without spawning a shell."""
+    console.clear()
+
+
+def show_usage(console, tracker):
+    """Prints the session's token usage and cost so far."""
+    console.print(f"\n[dim]{tracker.format_summary()}[/dim]")
+
+
+# Slash commands handled locally: command -> handler(console, tracker)
+SLASH_COMMANDS = {
+    "/clear": clear_screen,
+    "/usage": show_usage,
+}
+
 
 def main():
     parser = argparse.ArgumentParser(description="CLI Coding Assistant")
@@ -30,8 +61,7 @@ def main():
     working_dir = args.dir
     model = args.model
     
-    if not os.path.exists(working_dir):
-        os.makedirs(working_dir)
+    os.makedirs(working_dir, exist_ok=True)
 
     load_dotenv()
     
@@ -53,27 +83,29 @@ def main():
     console.print(f"[dim]Context limit: ~{detected_limit:,} tokens (75% of model max)[/dim]")
 
     console.print("[yellow]Starting...[/yellow]")
-    console.print("[dim]Commands: /clear, /usage, exit[/dim]")
+    console.print(f"[dim]Commands: {', '.join(SLASH_COMMANDS)}, exit[/dim]")
 
     while True:
         try:
-            user_input = console.input("\n[bold blue]You > [/bold blue]")
+            user_input = console.input(USER_PROMPT)
             cmd = user_input.strip().lower()
+
+            if not cmd:
+                continue
             
-            if cmd in ["exit", "quit"]:
+            if cmd in EXIT_COMMANDS:
+                release_history(messages)  # Abandon any background summary still running
                 console.print(f"\n[bold]Session Summary:[/bold]")
                 console.print(f"[dim]{tracker.format_summary()}[/dim]")
                 break
-                
-            elif cmd == "/clear":
-                os.system('cls' if os.name == 'nt' else 'clear')
-                continue
 
-            elif cmd == "/usage":
-                console.print(f"\n[dim]{tracker.format_summary()}[/dim]")
+            handler = SLASH_COMMANDS.get(cmd)
+            if handler is not None:
+                handler(console, tracker)
                 continue
 
-            if not cmd:
+            if cmd in THANKS_INPUTS:
+                console.print("[green]You're welcome![/green]")
                 continue
 
             messages = run_agent_loop(model, console, working_dir, user_input, messages, tracker=tracker)
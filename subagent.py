@@ -1,10 +1,12 @@
-import json
 from rich.markdown import Markdown
 
 from functions.get_files_info import get_file_info
 from ai_utils import safe_completion
 from agent_tools import SUBAGENT_TOOLS
-from agent_helpers import trim_memory, execute_tool
+from agent_helpers import (
+    trim_memory, release_history, execute_tool, execute_tools_parallel, status, parse_tool_args,
+    batch_tool_calls, PARALLEL_SAFE_TOOLS, FILE_TREE_HEADER,
+)
 from token_tracker import get_max_context_tokens
 
 SUBAGENT_SYSTEM_PROMPT = (
@@ -14,6 +16,7 @@ SUBAGENT_SYSTEM_PROMPT = (
     "AVAILABLE TOOLS & WHEN TO USE THEM:\n"
     "- `get_files_info`: Map out the directory structure and discover files.\n"
     "- `get_file_content`: Read a file BEFORE modifying it to gather its exact contents.\n"
+    "- `get_files_content`: Read several files in one call. PREFER this when you need more than one file.\n"
     "- `write_file`: Create a NEW file or modify an EXISTING file. You MUST provide the ENTIRE, complete file content. Use ONLY for new files or full rewrites.\n"
     "- `edit_file`: Edit an existing file by search/replace. PREFERRED for modifications — provide the exact text to find and its replacement.\n"
     "- `delete_file`: Delete an existing file.\n"
@@ -34,8 +37,12 @@ SUBAGENT_SYSTEM_PROMPT = (
 )
 
 
-def run_subagent(model, console, task_description, working_dir, tracker=None):
-    """Runs an isolated sub-agent that completes a task and returns a summary."""
+def run_subagent(model, console, task_description, working_dir, tracker=None, cancel_event=None):
+    """Runs an isolated sub-agent that completes a task and returns a summary.
+    
+    When run on a worker thread, the caller passes cancel_event and sets it on
+    Ctrl+C; the sub-agent stops before its next model call or tool call.
+    """
 
     tools = SUBAGENT_TOOLS
     approve_all = [False]
@@ -47,7 +54,7 @@ def run_subagent(model, console, task_description, working_dir, tracker=None):
 
     # Inject file tree once as a standalone message — never mutate messages[0].
     file_tree = get_file_info(working_dir, ".")
-    messages.append({"role": "system", "content": f"CURRENT PROJECT FILES:\n{file_tree}"})
+    messages.append({"role": "system", "content": FILE_TREE_HEADER + file_tree})
 
     console.print(f"\n[bold magenta] Sub-Agent spawned[/bold magenta]")
 
@@ -56,11 +63,14 @@ def run_subagent(model, console, task_description, working_dir, tracker=None):
 
     while iteration < MAX_ITERATIONS:
         iteration += 1
+        if cancel_event is not None and cancel_event.is_set():
+            release_history(messages)
+            return "Sub-agent cancelled by the user."
 
         max_tokens = get_max_context_tokens(model)
         messages = trim_memory(messages, max_tokens, console, model)
 
-        with console.status("[bold magenta]Sub-Agent thinking...[/bold magenta]", spinner="dots"):
+        with status(console, "[bold magenta]Sub-Agent thinking...[/bold magenta]"):
             response = safe_completion(
                 model=model,
                 messages=messages,
@@ -109,19 +119,31 @@ def run_subagent(model, console, task_description, working_dir, tracker=None):
         messages.append(assistant_msg)
         
         if parsed_tool_calls:
-            for tc in parsed_tool_calls:
+            for batch in batch_tool_calls(parsed_tool_calls):
+                # No more file writes or prompts once the user has interrupted
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                # Consecutive read-only calls run concurrently; results keep call order
+                if len(batch) > 1 and batch[0]["name"] in PARALLEL_SAFE_TOOLS:
+                    calls = [(tc["name"], parse_tool_args(tc["arguments"])) for tc in batch]
+                    results = execute_tools_parallel(calls, working_dir, console)
+                    messages.extend({
+                        "role": "tool",
+                        "name": tc["name"],
+                        "content": str(function_result),
+                        "tool_call_id": tc["id"]
+                    } for tc, function_result in zip(batch, results))
+                    continue
+
+                tc = batch[0]
                 function_name = tc["name"]
-                args_string = tc["arguments"]
                 tool_call_id = tc["id"]
-                
-                try:
-                    args = json.loads(args_string)
-                except json.JSONDecodeError:
-                    args = {}
+                args = parse_tool_args(tc["arguments"])
 
                 if function_name == "finish_task":
                     summary = args.get("summary", "Sub-agent completed without summary.")
                     console.print(f"[bold magenta] Sub-Agent finished[/bold magenta]")
+                    release_history(messages)  # Don't keep the finished history alive in the caches
                     return summary
                 
                 function_result = execute_tool(function_name, args, working_dir, approve_all, console)
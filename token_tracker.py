@@ -1,3 +1,4 @@
+import threading
 import litellm
 from functools import lru_cache
 
@@ -10,6 +11,7 @@ class TokenTracker:
         self.total_completion_tokens = 0
         self.total_cost = 0.0
         self.call_count = 0
+        self._lock = threading.Lock()  # Sub-agents may record from worker threads
 
     def record(self, response):
         """Extract usage from a LiteLLM response and accumulate totals."""
@@ -20,16 +22,17 @@ class TokenTracker:
         prompt = getattr(usage, "prompt_tokens", 0) or 0
         completion = getattr(usage, "completion_tokens", 0) or 0
 
-        self.total_prompt_tokens += prompt
-        self.total_completion_tokens += completion
-        self.call_count += 1
-
         # Use litellm's built-in cost calculation
         try:
             call_cost = litellm.completion_cost(completion_response=response)
-            self.total_cost += call_cost
         except Exception:
-            pass  # Model not in pricing DB — skip cost
+            call_cost = 0.0  # Model not in pricing DB — skip cost
+
+        with self._lock:
+            self.total_prompt_tokens += prompt
+            self.total_completion_tokens += completion
+            self.call_count += 1
+            self.total_cost += call_cost
 
     @property
     def total_tokens(self):